@@ -0,0 +1,79 @@
+"""
+Forge application entry point.
+
+Wires the route blueprints, request-scoped database handling and logging
+together into the Flask app served on the port configured in
+Config/ports.yaml (default 5000).
+"""
+
+import os
+import uuid
+
+import yaml
+from flask import Flask, jsonify, render_template
+
+from db_helpers import close_db, init_db, BASE_DIR
+from json_helpers import OrjsonProvider
+from logging_config import setup_logging, get_logger
+
+from routes.database import database_bp
+from routes.fields import fields_bp, fields_api_bp
+from routes.flow_designer import flow_designer_bp
+from routes.functions import functions_bp
+from routes.rule_groups import rule_groups_bp
+
+setup_logging()
+logger = get_logger(__name__)
+
+app = Flask(__name__)
+app.json = OrjsonProvider(app)
+app.secret_key = os.environ.get('FLASK_SECRET_KEY', 'dev-secret-key-change-me')
+
+# Runtime ID distinguishes this process's rows in GEE_ACTIVE_CONNECTIONS.
+APP_RUNTIME_ID = str(uuid.uuid4())
+app.config['APP_RUNTIME_ID'] = APP_RUNTIME_ID
+logger.info(f"Application started with runtime ID: {APP_RUNTIME_ID}")
+
+app.register_blueprint(database_bp)
+app.register_blueprint(fields_bp)
+app.register_blueprint(fields_api_bp)
+app.register_blueprint(flow_designer_bp)
+app.register_blueprint(functions_bp)
+app.register_blueprint(rule_groups_bp)
+
+app.teardown_appcontext(close_db)
+
+
+@app.route('/')
+def index():
+    """Landing page."""
+    return render_template('index.html')
+
+
+@app.route('/health')
+def health():
+    """Liveness probe used by manage.sh and the systemd unit."""
+    return jsonify({'status': 'ok', 'runtime_id': APP_RUNTIME_ID})
+
+
+def _load_port():
+    """Read the Forge port from Config/ports.yaml, defaulting to 5000."""
+    ports_path = os.path.join(os.path.dirname(BASE_DIR), 'Config', 'ports.yaml')
+    try:
+        with open(ports_path, 'r') as f:
+            ports = yaml.safe_load(f) or {}
+        return int(ports.get('forge', {}).get('port', 5000))
+    except (OSError, ValueError):
+        return 5000
+
+
+# Apply pending schema migrations at startup (idempotent script).
+init_db(os.path.join(BASE_DIR, 'db_updates.sql'))
+
+
+if __name__ == '__main__':
+    # threaded=True lets the dev server overlap the DB-bound handlers
+    # instead of serializing every request on one thread; the async
+    # probe endpoints in routes.database already release their worker
+    # while waiting on slow drivers.
+    app.run(host='0.0.0.0', port=_load_port(), debug=False, threaded=True)
@@ -0,0 +1,237 @@
+"""
+Forge Configuration Manager
+Implements Commandment 1: Configuration Lives Outside the Code
+
+Loads the YAML configuration into typed dataclasses, expands
+``${ENV_VAR:default}`` placeholders, and validates the values the rest of
+Forge depends on before the app starts serving.
+"""
+
+import os
+import re
+from dataclasses import dataclass, field
+
+import yaml
+
+from exceptions import ConfigurationError
+
+__all__ = [
+    'ConfigManager', 'ConfigurationError', 'ForgeConfig', 'AppConfig',
+    'ServerConfig', 'DatabaseConfig', 'PraxisConfig', 'LoggingConfig',
+    'SecurityConfig', 'ExternalServicesConfig', 'get_config',
+]
+
+_ENV_VAR_PATTERN = re.compile(r'\$\{([A-Za-z_][A-Za-z0-9_]*)(?::([^}]*))?\}')
+
+
+@dataclass
+class AppConfig:
+    name: str
+    version: str
+    environment: str
+    secret_key: str
+    runtime_id: str
+    debug: bool = False
+
+
+@dataclass
+class ServerConfig:
+    host: str
+    port: int
+    read_timeout: int = 30
+    write_timeout: int = 30
+
+
+@dataclass
+class DatabaseConfig:
+    main_path: str
+    worker_path: str
+    runtime_path: str
+    max_connections: int = 5
+
+
+@dataclass
+class PraxisConfig:
+    url: str
+    api_key: str = ''
+    timeout: int = 30
+    max_retries: int = 3
+
+
+@dataclass
+class LoggingConfig:
+    level: str = 'INFO'
+    format: str = 'json'
+    output: str = 'stdout'
+    correlation_enabled: bool = True
+
+
+@dataclass
+class SecurityConfig:
+    max_request_size: int = 1048576
+    rate_limit_per_minute: int = 60
+    jwt_secret: str = ''
+    jwt_expiry_hours: int = 24
+
+
+@dataclass
+class ExternalServicesConfig:
+    mysql: dict = field(default_factory=dict)
+    oracle: dict = field(default_factory=dict)
+
+
+@dataclass
+class ForgeConfig:
+    app: AppConfig
+    server: ServerConfig
+    database: DatabaseConfig
+    praxis: PraxisConfig
+    logging: LoggingConfig
+    security: SecurityConfig
+    external_services: ExternalServicesConfig
+
+
+class ConfigManager:
+    """Loads, validates and caches the Forge configuration."""
+
+    DEFAULT_CONFIG_PATH = os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), 'config.yaml')
+
+    def __init__(self, config_path=None):
+        self.config_path = config_path or self.DEFAULT_CONFIG_PATH
+        self._config = None
+
+    def load_config(self):
+        """Load and validate the configuration file."""
+        if not os.path.exists(self.config_path):
+            raise ConfigurationError(
+                f"Configuration file not found: {self.config_path}",
+                config_key=self.config_path)
+
+        with open(self.config_path, 'r') as f:
+            raw_content = f.read()
+
+        expanded = self._expand_environment_variables(raw_content)
+
+        try:
+            data = yaml.safe_load(expanded)
+        except yaml.YAMLError as e:
+            raise ConfigurationError(
+                f"Invalid YAML configuration: {e}", cause=e)
+
+        if not isinstance(data, dict):
+            raise ConfigurationError("Invalid YAML configuration: not a mapping")
+
+        config = self._build_config(data)
+        self._validate(config)
+        self._config = config
+        return config
+
+    def get_config(self):
+        """Return the cached configuration, loading it on first use."""
+        if self._config is None:
+            self._config = self.load_config()
+        return self._config
+
+    def reload_config(self):
+        """Force a fresh load of the configuration file."""
+        self._config = None
+        return self.load_config()
+
+    def _expand_environment_variables(self, content):
+        """Expand ``${VAR}`` and ``${VAR:default}`` placeholders."""
+
+        def replace(match):
+            var_name, default = match.group(1), match.group(2)
+            return os.environ.get(var_name, default if default is not None else '')
+
+        return _ENV_VAR_PATTERN.sub(replace, content)
+
+    @staticmethod
+    def _to_bool(value):
+        """Convert a configuration string to a boolean."""
+        if isinstance(value, bool):
+            return value
+        return str(value).lower() in ('true', '1', 'yes', 'on')
+
+    def _build_config(self, data):
+        try:
+            app_data = data['app']
+            server_data = data['server']
+            db_data = data['database']
+            praxis_data = data.get('praxis', {})
+            logging_data = data.get('logging', {})
+            security_data = data.get('security', {})
+            external_data = data.get('external_services', {})
+
+            return ForgeConfig(
+                app=AppConfig(
+                    name=app_data['name'],
+                    version=app_data['version'],
+                    environment=app_data['environment'],
+                    secret_key=app_data.get('secret_key', ''),
+                    runtime_id=app_data.get('runtime_id', ''),
+                    debug=self._to_bool(app_data.get('debug', 'false')),
+                ),
+                server=ServerConfig(
+                    host=server_data['host'],
+                    port=int(server_data['port']),
+                    read_timeout=int(server_data.get('read_timeout', 30)),
+                    write_timeout=int(server_data.get('write_timeout', 30)),
+                ),
+                database=DatabaseConfig(
+                    main_path=db_data['main']['path'],
+                    worker_path=db_data['worker']['path'],
+                    runtime_path=db_data['runtime']['path'],
+                    max_connections=int(db_data['main'].get('max_connections', 5)),
+                ),
+                praxis=PraxisConfig(
+                    url=praxis_data.get('url', 'http://localhost:8080'),
+                    api_key=praxis_data.get('api_key', ''),
+                    timeout=int(praxis_data.get('timeout', 30)),
+                    max_retries=int(praxis_data.get('max_retries', 3)),
+                ),
+                logging=LoggingConfig(
+                    level=logging_data.get('level', 'INFO'),
+                    format=logging_data.get('format', 'json'),
+                    output=logging_data.get('output', 'stdout'),
+                    correlation_enabled=self._to_bool(
+                        logging_data.get('correlation_enabled', 'true')),
+                ),
+                security=SecurityConfig(
+                    max_request_size=int(security_data.get('max_request_size', 1048576)),
+                    rate_limit_per_minute=int(security_data.get('rate_limit_per_minute', 60)),
+                    jwt_secret=security_data.get('jwt_secret', ''),
+                    jwt_expiry_hours=int(security_data.get('jwt_expiry_hours', 24)),
+                ),
+                external_services=ExternalServicesConfig(
+                    mysql=external_data.get('mysql', {}),
+                    oracle=external_data.get('oracle', {}),
+                ),
+            )
+        except (KeyError, TypeError, ValueError) as e:
+            raise ConfigurationError(
+                f"Invalid configuration structure: {e}", cause=e)
+
+    @staticmethod
+    def _validate(config):
+        if not config.app.secret_key:
+            raise ConfigurationError(
+                "Flask secret key is required", config_key='app.secret_key')
+        if not (1 <= config.server.port <= 65535):
+            raise ConfigurationError(
+                f"Invalid server port: {config.server.port}",
+                config_key='server.port')
+        if config.database.max_connections < 1:
+            raise ConfigurationError(
+                "database.main.max_connections must be at least 1",
+                config_key='database.main.max_connections')
+
+
+# Module-level singleton used by the application.
+_manager = ConfigManager()
+
+
+def get_config():
+    """Return the process-wide Forge configuration."""
+    return _manager.get_config()
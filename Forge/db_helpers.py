@@ -0,0 +1,255 @@
+"""
+Database helpers for Forge.
+
+Thin wrappers around sqlite3 used by every route module. Connections are
+opened per request context and stored on flask.g; query_db/modify_db add
+debug-mode SQL timing via logging_config.log_sql_query.
+"""
+
+import os
+import queue
+import sqlite3
+import time
+from contextlib import contextmanager
+
+from flask import g
+
+from logging_config import get_logger, log_sql_query
+
+logger = get_logger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATABASE = os.environ.get(
+    'GEE_DB_PATH',
+    os.path.join(os.path.dirname(BASE_DIR), 'instance', 'GEE.db'),
+)
+
+
+# Bounded pool of ready connections. Reusing a connection keeps its page
+# cache and prepared-statement cache hot across requests instead of
+# paying connect + PRAGMA setup per request.
+_POOL_SIZE = 8
+_pool = queue.Queue(maxsize=_POOL_SIZE)
+
+
+def _new_connection():
+    """Open and configure a pooled connection."""
+    db = sqlite3.connect(DATABASE, cached_statements=256,
+                         check_same_thread=False)
+    db.row_factory = sqlite3.Row
+    db.execute('PRAGMA foreign_keys = ON')
+    # WAL allows concurrent readers during writes; synchronous=NORMAL
+    # amortizes fsync cost while staying durable under WAL.
+    db.execute('PRAGMA journal_mode = WAL')
+    db.execute('PRAGMA synchronous = NORMAL')
+    db.execute('PRAGMA temp_store = MEMORY')
+    db.execute('PRAGMA cache_size = -131072')
+    db.execute('PRAGMA mmap_size = 268435456')
+    return db
+
+
+def get_db():
+    """Return the sqlite3 connection for the current request context,
+    checking one out of the pool (or opening one) on first use."""
+    db = getattr(g, '_database', None)
+    if db is None:
+        try:
+            db = _pool.get_nowait()
+        except queue.Empty:
+            db = _new_connection()
+        g._database = db
+    return db
+
+
+def close_db(exception=None):
+    """Teardown handler: return the request's connection to the pool.
+
+    A connection that saw an unhandled exception is closed instead, so a
+    half-open transaction can never leak into the next request.
+    """
+    db = getattr(g, '_database', None)
+    if db is None:
+        return
+    g._database = None
+    if exception is not None:
+        db.close()
+        return
+    try:
+        db.rollback()
+        _pool.put_nowait(db)
+    except (queue.Full, sqlite3.Error):
+        db.close()
+
+
+def query_db(query, args=(), one=False):
+    """Run a SELECT and return Row objects (or a single Row with one=True)."""
+    start = time.time()
+    cur = get_db().execute(query, args)
+    rows = cur.fetchall()
+    cur.close()
+    log_sql_query(query, args, (time.time() - start) * 1000, result_count=len(rows))
+    if one:
+        return rows[0] if rows else None
+    return rows
+
+
+def query_db_iter(query, args=()):
+    """Run a SELECT and yield rows straight from the live cursor.
+
+    For streaming endpoints: rows are serialized and flushed one at a
+    time instead of being materialized as a list first.
+    """
+    start = time.time()
+    cur = get_db().execute(query, args)
+    count = 0
+    try:
+        for row in cur:
+            count += 1
+            yield row
+    finally:
+        cur.close()
+        log_sql_query(query, args, (time.time() - start) * 1000,
+                      result_count=count)
+
+
+def modify_db(query, args=()):
+    """Run an INSERT/UPDATE/DELETE, commit, and return the last row id."""
+    start = time.time()
+    db = get_db()
+    cur = db.execute(query, args)
+    db.commit()
+    last_id = cur.lastrowid
+    rowcount = cur.rowcount
+    cur.close()
+    log_sql_query(query, args, (time.time() - start) * 1000, result_count=rowcount)
+    return last_id
+
+
+def modify_db_returning(query, args=()):
+    """Run a RETURNING statement, commit, and return the fetched rows.
+
+    Lets write endpoints hand back the affected row without a follow-up
+    SELECT round-trip.
+    """
+    start = time.time()
+    db = get_db()
+    cur = db.execute(query, args)
+    rows = cur.fetchall()
+    db.commit()
+    cur.close()
+    log_sql_query(query, args, (time.time() - start) * 1000, result_count=len(rows))
+    return rows
+
+
+def modify_many(query, seq_of_args):
+    """Run one statement for many parameter rows in a single transaction.
+
+    Commits once, so bulk writes pay for one fsync instead of one per row.
+    Returns the total affected row count.
+    """
+    start = time.time()
+    db = get_db()
+    with db:
+        cur = db.executemany(query, seq_of_args)
+        rowcount = cur.rowcount
+        cur.close()
+    log_sql_query(query, f'<{len(seq_of_args)} rows>',
+                  (time.time() - start) * 1000, result_count=rowcount)
+    return rowcount
+
+
+def modify_db_many(statements):
+    """Run several (query, args) statements in one transaction.
+
+    A single BEGIN/COMMIT means one fsync for the whole batch instead of
+    one per statement. Returns the last statement's lastrowid.
+    """
+    start = time.time()
+    db = get_db()
+    last_id = None
+    try:
+        db.execute('BEGIN IMMEDIATE')
+        for query, args in statements:
+            cur = db.execute(query, args)
+            last_id = cur.lastrowid
+            cur.close()
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    log_sql_query(f'<batch of {len(statements)} statements>', (),
+                  (time.time() - start) * 1000)
+    return last_id
+
+
+@contextmanager
+def transaction():
+    """Run a block of statements as one BEGIN IMMEDIATE/COMMIT.
+
+    Yields the request connection; execute statements on it directly
+    (modify_db would commit mid-block). The whole block pays one fsync
+    and rolls back as a unit on error.
+    """
+    db = get_db()
+    start = time.time()
+    db.execute('BEGIN IMMEDIATE')
+    try:
+        yield db
+    except Exception:
+        db.rollback()
+        raise
+    db.commit()
+    log_sql_query('<transaction>', (), (time.time() - start) * 1000)
+
+
+def _iter_statements(script):
+    """Yield complete statements from a SQL script.
+
+    Splits on statement boundaries rather than raw semicolons so trigger
+    bodies stay intact.
+    """
+    buf = []
+    for line in script.splitlines():
+        if not buf and (not line.strip() or line.lstrip().startswith('--')):
+            continue
+        buf.append(line)
+        if sqlite3.complete_statement('\n'.join(buf)):
+            yield '\n'.join(buf)
+            buf = []
+    tail = '\n'.join(buf).strip()
+    if tail:
+        yield tail
+
+
+def apply_sql_script(conn, script):
+    """Apply a migration script one statement at a time.
+
+    A statement that references a table the target database does not
+    have is logged and skipped instead of aborting the whole script, so
+    startup migrations stay safe against databases that carry only part
+    of the schema.
+    """
+    for statement in _iter_statements(script):
+        try:
+            conn.execute(statement)
+        except sqlite3.OperationalError as e:
+            if 'no such table' not in str(e):
+                raise
+            first_line = next(
+                (l.strip() for l in statement.splitlines()
+                 if l.strip() and not l.lstrip().startswith('--')), '')
+            logger.warning(f"Skipping migration statement ({e}): {first_line}")
+    conn.commit()
+
+
+def init_db(schema_path):
+    """Apply the startup migration script to the main database."""
+    if not os.path.exists(schema_path):
+        return
+    conn = sqlite3.connect(DATABASE)
+    try:
+        with open(schema_path, 'r') as f:
+            apply_sql_script(conn, f.read())
+        logger.info(f"Successfully executed SQL from {schema_path}")
+    finally:
+        conn.close()
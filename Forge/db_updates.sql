@@ -0,0 +1,312 @@
+-- Idempotent schema updates applied at Forge startup (see app.py / init_db).
+-- Each statement must be safe to re-run against an already-migrated database.
+-- init_db applies statements one at a time and skips any whose tables are
+-- absent, so the script also tolerates databases carrying only part of the
+-- schema.
+
+-- Legacy flat environment config. Bootstrapped here because
+-- GEE_ACTIVE_CONNECTIONS below declares a foreign key against it (and
+-- connections run with foreign_keys ON): without the table, every
+-- handle write on a database that predates it fails at the FK check.
+CREATE TABLE IF NOT EXISTS GEE_ENV_CONFIG (
+    GT_ID INTEGER PRIMARY KEY,
+    ENV_NAME TEXT NOT NULL,
+    DB_NAME TEXT NOT NULL,
+    DB_PASSWORD TEXT,
+    DB_INSTANCE TEXT,
+    DB_TYPE TEXT,
+    DB_PORT INTEGER,
+    LINUX_USER TEXT,
+    LINUX_PASSWORD TEXT,
+    LINUX_HOST TEXT,
+    DB_USERNAME TEXT,
+    DB_HOST TEXT,
+    ORACLE_CONN_TYPE TEXT DEFAULT 'service',
+    LAST_TESTED DATETIME,
+    PRAXIS_HOST TEXT,
+    PRAXIS_PORT INTEGER,
+    PRAXIS_STATUS TEXT DEFAULT 'disconnected',
+    PRAXIS_LAST_SYNC DATETIME
+);
+
+CREATE TABLE IF NOT EXISTS GEE_ACTIVE_CONNECTIONS (
+    HANDLE TEXT PRIMARY KEY,
+    CONFIG_ID INTEGER NOT NULL,
+    CREATED TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    STATUS TEXT DEFAULT 'active',
+    APP_RUNTIME_ID TEXT,
+    DB_CONFIG_ID INTEGER,
+    FOREIGN KEY (CONFIG_ID) REFERENCES GEE_ENV_CONFIG (GT_ID)
+);
+
+-- Hot lookups: get_active_connections and cleanup_connections filter by
+-- APP_RUNTIME_ID. The runtime index carries every column the polled
+-- endpoint projects, so the scan is satisfied from the index alone
+-- (SQLite has no INCLUDE clause; a composite index is the covering form).
+DROP INDEX IF EXISTS idx_ac_runtime;
+CREATE INDEX IF NOT EXISTS idx_ac_runtime_covering
+    ON GEE_ACTIVE_CONNECTIONS(APP_RUNTIME_ID, HANDLE, CONFIG_ID,
+                              DB_CONFIG_ID, STATUS, CREATED);
+CREATE INDEX IF NOT EXISTS idx_ac_handle_runtime
+    ON GEE_ACTIVE_CONNECTIONS(HANDLE, APP_RUNTIME_ID);
+
+-- Field classes and fields; created here so the field routes (and the
+-- index/FTS statements below) work on databases that predate them.
+CREATE TABLE IF NOT EXISTS GEE_FIELD_CLASSES (
+    GFC_ID INTEGER PRIMARY KEY,
+    GFC_IS INTEGER,
+    FIELD_CLASS_NAME TEXT NOT NULL,
+    CLASS_TYPE TEXT NOT NULL,
+    PARENT_GFC_ID INTEGER,
+    CREATE_DATE DATETIME DEFAULT CURRENT_TIMESTAMP,
+    UPDATE_DATE DATETIME,
+    DESCRIPTION TEXT
+);
+CREATE TABLE IF NOT EXISTS GEE_FIELDS (
+    GF_ID INTEGER PRIMARY KEY,
+    GFC_ID INTEGER,
+    GF_NAME TEXT NOT NULL,
+    GF_TYPE TEXT NOT NULL,
+    GF_SIZE INTEGER,
+    GF_PRECISION_SIZE INTEGER,
+    GF_DEFAULT_VALUE TEXT,
+    CREATE_DATE DATETIME DEFAULT CURRENT_TIMESTAMP,
+    UPDATE_DATE DATETIME,
+    GF_DESCRIPTION TEXT,
+    FOREIGN KEY (GFC_ID) REFERENCES GEE_FIELD_CLASSES(GFC_ID)
+);
+
+-- Field listings: fields-by-class is ordered by GF_NAME within GFC_ID,
+-- and the class tree walks PARENT_GFC_ID ordered by name.
+CREATE INDEX IF NOT EXISTS idx_fields_gfcid
+    ON GEE_FIELDS(GFC_ID, GF_NAME);
+CREATE INDEX IF NOT EXISTS idx_classes_parent
+    ON GEE_FIELD_CLASSES(PARENT_GFC_ID, FIELD_CLASS_NAME);
+
+-- Full-text shadow index for field search: leading-wildcard LIKE can
+-- never use a B-tree index, FTS5 MATCH is an index probe. External
+-- content keeps the text out of the main table; triggers keep it in
+-- sync and the rebuild makes the (idempotent) script safe on databases
+-- that predate the index.
+CREATE VIRTUAL TABLE IF NOT EXISTS GEE_FIELDS_FTS USING fts5(
+    GF_NAME, GF_TYPE, GF_DESCRIPTION,
+    content='GEE_FIELDS', content_rowid='GF_ID'
+);
+CREATE TRIGGER IF NOT EXISTS trg_fields_fts_ai AFTER INSERT ON GEE_FIELDS BEGIN
+    INSERT INTO GEE_FIELDS_FTS(rowid, GF_NAME, GF_TYPE, GF_DESCRIPTION)
+    VALUES (new.GF_ID, new.GF_NAME, new.GF_TYPE, new.GF_DESCRIPTION);
+END;
+CREATE TRIGGER IF NOT EXISTS trg_fields_fts_ad AFTER DELETE ON GEE_FIELDS BEGIN
+    INSERT INTO GEE_FIELDS_FTS(GEE_FIELDS_FTS, rowid, GF_NAME, GF_TYPE, GF_DESCRIPTION)
+    VALUES ('delete', old.GF_ID, old.GF_NAME, old.GF_TYPE, old.GF_DESCRIPTION);
+END;
+CREATE TRIGGER IF NOT EXISTS trg_fields_fts_au AFTER UPDATE ON GEE_FIELDS BEGIN
+    INSERT INTO GEE_FIELDS_FTS(GEE_FIELDS_FTS, rowid, GF_NAME, GF_TYPE, GF_DESCRIPTION)
+    VALUES ('delete', old.GF_ID, old.GF_NAME, old.GF_TYPE, old.GF_DESCRIPTION);
+    INSERT INTO GEE_FIELDS_FTS(rowid, GF_NAME, GF_TYPE, GF_DESCRIPTION)
+    VALUES (new.GF_ID, new.GF_NAME, new.GF_TYPE, new.GF_DESCRIPTION);
+END;
+INSERT INTO GEE_FIELDS_FTS(GEE_FIELDS_FTS) VALUES ('rebuild');
+
+-- Base functions; created here so the function routes, the FTS block
+-- and the (FUNC_NAME, GBF_ID) keyset index below work on databases
+-- that predate them.
+CREATE TABLE IF NOT EXISTS GEE_BASE_FUNCTIONS (
+    GBF_ID INTEGER PRIMARY KEY,
+    FUNC_NAME TEXT NOT NULL,
+    PARAM_COUNT INTEGER,
+    CREATE_DATE DATETIME DEFAULT CURRENT_TIMESTAMP,
+    UPDATE_DATE DATETIME,
+    DESCRIPTION TEXT
+);
+
+-- Function search: same FTS5 external-content pattern as the fields
+-- index above, so get_functions' search is an index probe instead of a
+-- leading-wildcard LIKE scan.
+CREATE VIRTUAL TABLE IF NOT EXISTS GEE_FUNCTIONS_FTS USING fts5(
+    FUNC_NAME, DESCRIPTION,
+    content='GEE_BASE_FUNCTIONS', content_rowid='GBF_ID'
+);
+CREATE TRIGGER IF NOT EXISTS trg_functions_fts_ai AFTER INSERT ON GEE_BASE_FUNCTIONS BEGIN
+    INSERT INTO GEE_FUNCTIONS_FTS(rowid, FUNC_NAME, DESCRIPTION)
+    VALUES (new.GBF_ID, new.FUNC_NAME, new.DESCRIPTION);
+END;
+CREATE TRIGGER IF NOT EXISTS trg_functions_fts_ad AFTER DELETE ON GEE_BASE_FUNCTIONS BEGIN
+    INSERT INTO GEE_FUNCTIONS_FTS(GEE_FUNCTIONS_FTS, rowid, FUNC_NAME, DESCRIPTION)
+    VALUES ('delete', old.GBF_ID, old.FUNC_NAME, old.DESCRIPTION);
+END;
+CREATE TRIGGER IF NOT EXISTS trg_functions_fts_au AFTER UPDATE ON GEE_BASE_FUNCTIONS BEGIN
+    INSERT INTO GEE_FUNCTIONS_FTS(GEE_FUNCTIONS_FTS, rowid, FUNC_NAME, DESCRIPTION)
+    VALUES ('delete', old.GBF_ID, old.FUNC_NAME, old.DESCRIPTION);
+    INSERT INTO GEE_FUNCTIONS_FTS(rowid, FUNC_NAME, DESCRIPTION)
+    VALUES (new.GBF_ID, new.FUNC_NAME, new.DESCRIPTION);
+END;
+INSERT INTO GEE_FUNCTIONS_FTS(GEE_FUNCTIONS_FTS) VALUES ('rebuild');
+
+-- Flow designer tables; created here so the designer endpoints and the
+-- FLOW_ID indexes below work on databases that predate them.
+CREATE TABLE IF NOT EXISTS GEE_FLOWS (
+    FLOW_ID INTEGER PRIMARY KEY,
+    FLOW_NAME TEXT NOT NULL,
+    DESCRIPTION TEXT,
+    VERSION INTEGER DEFAULT 1,
+    STATUS TEXT DEFAULT 'DRAFT',
+    CREATE_DATE DATETIME DEFAULT CURRENT_TIMESTAMP,
+    UPDATE_DATE DATETIME,
+    CREATED_BY TEXT,
+    LAST_EDITED_BY TEXT
+);
+CREATE TABLE IF NOT EXISTS GEE_FLOW_NODES (
+    NODE_ID INTEGER PRIMARY KEY,
+    FLOW_ID INTEGER,
+    NODE_TYPE TEXT NOT NULL,
+    REFERENCE_ID INTEGER,
+    PARENT_NODE_ID INTEGER,
+    POSITION_X REAL,
+    POSITION_Y REAL,
+    WIDTH REAL,
+    HEIGHT REAL,
+    LABEL TEXT,
+    CUSTOM_SETTINGS TEXT,
+    CREATE_DATE DATETIME DEFAULT CURRENT_TIMESTAMP,
+    UPDATE_DATE DATETIME,
+    FOREIGN KEY (FLOW_ID) REFERENCES GEE_FLOWS(FLOW_ID),
+    FOREIGN KEY (PARENT_NODE_ID) REFERENCES GEE_FLOW_NODES(NODE_ID)
+);
+CREATE TABLE IF NOT EXISTS GEE_FLOW_CONNECTIONS (
+    CONNECTION_ID INTEGER PRIMARY KEY,
+    FLOW_ID INTEGER,
+    SOURCE_NODE_ID INTEGER,
+    TARGET_NODE_ID INTEGER,
+    CONNECTION_TYPE TEXT,
+    CONDITION_EXPRESSION TEXT,
+    LABEL TEXT,
+    STYLE_SETTINGS TEXT,
+    CREATE_DATE DATETIME DEFAULT CURRENT_TIMESTAMP,
+    UPDATE_DATE DATETIME,
+    FOREIGN KEY (FLOW_ID) REFERENCES GEE_FLOWS(FLOW_ID),
+    FOREIGN KEY (SOURCE_NODE_ID) REFERENCES GEE_FLOW_NODES(NODE_ID),
+    FOREIGN KEY (TARGET_NODE_ID) REFERENCES GEE_FLOW_NODES(NODE_ID)
+);
+CREATE TABLE IF NOT EXISTS GEE_FLOW_VERSIONS (
+    VERSION_ID INTEGER PRIMARY KEY,
+    FLOW_ID INTEGER,
+    VERSION_NUMBER INTEGER,
+    FLOW_DATA TEXT,
+    CREATE_DATE DATETIME DEFAULT CURRENT_TIMESTAMP,
+    CREATED_BY TEXT,
+    COMMENTS TEXT,
+    FOREIGN KEY (FLOW_ID) REFERENCES GEE_FLOWS(FLOW_ID)
+);
+
+-- Rule lines; created here so delete_function's in-use probe and the
+-- FUNCTION_ID index below work on databases that predate them.
+CREATE TABLE IF NOT EXISTS GEE_RULE_LINES (
+    LINE_ID INTEGER PRIMARY KEY,
+    RULE_ID INTEGER NOT NULL,
+    SEQUENCE_NUM INTEGER NOT NULL,
+    FUNCTION_ID INTEGER NOT NULL,
+    IS_CONDITION BOOLEAN NOT NULL,
+    CREATE_DATE DATETIME DEFAULT CURRENT_TIMESTAMP,
+    UPDATE_DATE DATETIME,
+    FOREIGN KEY (RULE_ID) REFERENCES GEE_RULES(RULE_ID),
+    FOREIGN KEY (FUNCTION_ID) REFERENCES GEE_BASE_FUNCTIONS(GBF_ID)
+);
+
+-- Flow graph lookups: get_flow and delete_flow filter each graph table
+-- by FLOW_ID, and delete_function's in-use check probes rule lines by
+-- FUNCTION_ID; without these every lookup is a full table scan.
+CREATE INDEX IF NOT EXISTS idx_nodes_flow ON GEE_FLOW_NODES(FLOW_ID);
+CREATE INDEX IF NOT EXISTS idx_conn_flow ON GEE_FLOW_CONNECTIONS(FLOW_ID);
+CREATE INDEX IF NOT EXISTS idx_ver_flow ON GEE_FLOW_VERSIONS(FLOW_ID);
+CREATE INDEX IF NOT EXISTS idx_rulelines_func ON GEE_RULE_LINES(FUNCTION_ID);
+
+-- Parameter rows per base function. The shipped database predates this
+-- table, so the count triggers and backfill below need it bootstrapped
+-- here before they can reference it.
+CREATE TABLE IF NOT EXISTS GEE_BASE_FUNCTIONS_PARAMS (
+    PARAM_ID INTEGER PRIMARY KEY AUTOINCREMENT,
+    GBF_ID INTEGER NOT NULL,
+    PARAM_NAME TEXT NOT NULL,
+    PARAM_TYPE TEXT NOT NULL,
+    PARAM_ORDER INTEGER NOT NULL,
+    FOREIGN KEY (GBF_ID) REFERENCES GEE_BASE_FUNCTIONS (GBF_ID)
+);
+
+-- Denormalized per-function parameter counts. get_functions joins this
+-- one-row-per-function table instead of running a correlated COUNT over
+-- the params table for every listed row. Triggers keep it exact; the
+-- wipe-and-rebuild below makes the script idempotent (PARAM_COUNT on
+-- GEE_BASE_FUNCTIONS itself is the user-declared count, so it cannot
+-- double as the actual one).
+CREATE TABLE IF NOT EXISTS GEE_FUNCTION_PARAM_COUNTS (
+    GBF_ID INTEGER PRIMARY KEY,
+    N INTEGER NOT NULL DEFAULT 0
+);
+CREATE TRIGGER IF NOT EXISTS trg_param_counts_ai
+AFTER INSERT ON GEE_BASE_FUNCTIONS_PARAMS BEGIN
+    INSERT INTO GEE_FUNCTION_PARAM_COUNTS (GBF_ID, N) VALUES (new.GBF_ID, 1)
+    ON CONFLICT(GBF_ID) DO UPDATE SET N = N + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_param_counts_ad
+AFTER DELETE ON GEE_BASE_FUNCTIONS_PARAMS BEGIN
+    UPDATE GEE_FUNCTION_PARAM_COUNTS SET N = N - 1
+    WHERE GBF_ID = old.GBF_ID;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_param_counts_au
+AFTER UPDATE OF GBF_ID ON GEE_BASE_FUNCTIONS_PARAMS BEGIN
+    UPDATE GEE_FUNCTION_PARAM_COUNTS SET N = N - 1
+    WHERE GBF_ID = old.GBF_ID;
+    INSERT INTO GEE_FUNCTION_PARAM_COUNTS (GBF_ID, N) VALUES (new.GBF_ID, 1)
+    ON CONFLICT(GBF_ID) DO UPDATE SET N = N + 1;
+END;
+DELETE FROM GEE_FUNCTION_PARAM_COUNTS;
+INSERT INTO GEE_FUNCTION_PARAM_COUNTS (GBF_ID, N)
+    SELECT GBF_ID, COUNT(*) FROM GEE_BASE_FUNCTIONS_PARAMS GROUP BY GBF_ID;
+
+-- Function listing order and keyset seeks: get_functions orders by
+-- (FUNC_NAME, GBF_ID) and the cursor path seeks past that tuple.
+CREATE INDEX IF NOT EXISTS idx_gbf_name_id
+    ON GEE_BASE_FUNCTIONS(FUNC_NAME, GBF_ID);
+
+-- Refresh planner statistics after index changes.
+ANALYZE;
+
+-- Environments and their database configurations; created here so a
+-- fresh clone (whose default database predates these features) boots
+-- with the tables the database routes serve.
+CREATE TABLE IF NOT EXISTS GEE_ENVIRONMENTS (
+    ENV_ID INTEGER PRIMARY KEY AUTOINCREMENT,
+    ENV_NAME TEXT NOT NULL UNIQUE,
+    ENV_TYPE TEXT NOT NULL DEFAULT 'DEV',
+    DESCRIPTION TEXT,
+    CREATE_DATE DATETIME DEFAULT CURRENT_TIMESTAMP,
+    UPDATE_DATE DATETIME
+);
+CREATE TABLE IF NOT EXISTS GEE_DATABASE_CONFIGS (
+    DB_CONFIG_ID INTEGER PRIMARY KEY AUTOINCREMENT,
+    ENV_ID INTEGER NOT NULL,
+    DB_NAME TEXT NOT NULL,
+    DB_DISPLAY_NAME TEXT NOT NULL,
+    DB_TYPE TEXT NOT NULL,
+    DB_HOST TEXT,
+    DB_PORT INTEGER,
+    DB_USERNAME TEXT,
+    DB_PASSWORD TEXT,
+    DB_INSTANCE TEXT,
+    ORACLE_CONN_TYPE TEXT DEFAULT 'service',
+    LINUX_USER TEXT,
+    LINUX_PASSWORD TEXT,
+    LINUX_HOST TEXT,
+    IS_PRIMARY BOOLEAN DEFAULT 0,
+    STATUS TEXT DEFAULT 'active',
+    CREATE_DATE DATETIME DEFAULT CURRENT_TIMESTAMP,
+    UPDATE_DATE DATETIME,
+    LAST_TESTED DATETIME,
+    FOREIGN KEY (ENV_ID) REFERENCES GEE_ENVIRONMENTS(ENV_ID) ON DELETE CASCADE
+);
+
+-- At most one primary database per environment; lets add_database_config
+-- rely on the database to enforce the invariant instead of pre-querying.
+CREATE UNIQUE INDEX IF NOT EXISTS uniq_primary_per_env
+    ON GEE_DATABASE_CONFIGS(ENV_ID) WHERE IS_PRIMARY = 1;
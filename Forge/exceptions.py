@@ -0,0 +1,225 @@
+"""
+Forge Exception Hierarchy
+Implements Commandment 2: Errors Are Values and Must Be Handled
+
+Every error raised by Forge derives from ForgeError so callers can catch a
+single base class, inspect a stable machine-readable error code, and get
+structured details suitable for JSON responses and audit logs.
+"""
+
+
+class ForgeError(Exception):
+    """Base exception for all Forge errors."""
+
+    def __init__(self, message, error_code=None, details=None, cause=None):
+        super().__init__(message)
+        self.message = message
+        self.error_code = error_code or self.__class__.__name__.upper()
+        self.details = details if details is not None else {}
+        self.cause = cause
+
+    def __str__(self):
+        parts = [f"{self.error_code}: {self.message}"]
+        if self.details:
+            detail_str = ", ".join(f"{k}={v}" for k, v in self.details.items())
+            parts.append(f"({detail_str})")
+        if self.cause is not None:
+            parts.append(f"Caused by: {self.cause}")
+        return " ".join(parts)
+
+    def to_dict(self):
+        """Serialize the error for JSON responses."""
+        error_dict = {
+            'error': self.error_code,
+            'message': self.message,
+            'details': self.details,
+        }
+        if self.cause is not None:
+            error_dict['caused_by'] = str(self.cause)
+        return error_dict
+
+
+class ConfigurationError(ForgeError):
+    """Raised when configuration loading or validation fails."""
+
+    def __init__(self, message, config_key=None, **kwargs):
+        details = kwargs.pop('details', {})
+        if config_key:
+            details['config_key'] = config_key
+        super().__init__(message, error_code="CONFIGURATION_ERROR",
+                         details=details, **kwargs)
+
+
+class DatabaseError(ForgeError):
+    """Raised when a database operation fails."""
+
+    def __init__(self, message, operation=None, table=None, **kwargs):
+        details = kwargs.pop('details', {})
+        if operation:
+            details['operation'] = operation
+        if table:
+            details['table'] = table
+        super().__init__(message, error_code="DATABASE_ERROR",
+                         details=details, **kwargs)
+
+
+class DatabaseConnectionError(DatabaseError):
+    """Raised when a database connection cannot be established."""
+
+    def __init__(self, message, connection_string=None, **kwargs):
+        details = kwargs.pop('details', {})
+        if connection_string:
+            # Only record the scheme - never credentials - in details.
+            details['connection_type'] = connection_string.split('://', 1)[0]
+        super(DatabaseError, self).__init__(
+            message, error_code="DATABASE_CONNECTION_ERROR",
+            details=details, **kwargs)
+
+
+class ValidationError(ForgeError):
+    """Raised when input validation fails."""
+
+    def __init__(self, message, field=None, value=None, **kwargs):
+        details = kwargs.pop('details', {})
+        if field:
+            details['field'] = field
+        if value is not None:
+            value_str = str(value)
+            if len(value_str) > 100:
+                value_str = value_str[:100] + '...'
+            details['value'] = value_str
+        super().__init__(message, error_code="VALIDATION_ERROR",
+                         details=details, **kwargs)
+
+
+class AuthenticationError(ForgeError):
+    """Raised when authentication fails."""
+
+    def __init__(self, message, user_id=None, **kwargs):
+        details = kwargs.pop('details', {})
+        if user_id:
+            details['user_id'] = user_id
+        super().__init__(message, error_code="AUTHENTICATION_ERROR",
+                         details=details, **kwargs)
+
+
+class AuthorizationError(ForgeError):
+    """Raised when a caller lacks permission for an operation."""
+
+    def __init__(self, message, user_id=None, required_permission=None, **kwargs):
+        details = kwargs.pop('details', {})
+        if user_id:
+            details['user_id'] = user_id
+        if required_permission:
+            details['required_permission'] = required_permission
+        super().__init__(message, error_code="AUTHORIZATION_ERROR",
+                         details=details, **kwargs)
+
+
+class PraxisCommunicationError(ForgeError):
+    """Raised when communication with the Praxis engine fails."""
+
+    def __init__(self, message, endpoint=None, status_code=None, **kwargs):
+        details = kwargs.pop('details', {})
+        if endpoint:
+            details['endpoint'] = endpoint
+        if status_code is not None:
+            details['status_code'] = status_code
+        super().__init__(message, error_code="PRAXIS_COMMUNICATION_ERROR",
+                         details=details, **kwargs)
+
+
+class ExecutionError(ForgeError):
+    """Raised when rule or flow execution fails."""
+
+    def __init__(self, message, execution_id=None, rule_id=None,
+                 flow_id=None, phase=None, **kwargs):
+        details = kwargs.pop('details', {})
+        if execution_id:
+            details['execution_id'] = execution_id
+        if rule_id:
+            details['rule_id'] = rule_id
+        if flow_id:
+            details['flow_id'] = flow_id
+        if phase:
+            details['phase'] = phase
+        super().__init__(message, error_code="EXECUTION_ERROR",
+                         details=details, **kwargs)
+
+
+class ResourceNotFoundError(ForgeError):
+    """Raised when a requested resource does not exist."""
+
+    def __init__(self, message, resource_type=None, resource_id=None, **kwargs):
+        details = kwargs.pop('details', {})
+        if resource_type:
+            details['resource_type'] = resource_type
+        if resource_id is not None:
+            details['resource_id'] = resource_id
+        super().__init__(message, error_code="RESOURCE_NOT_FOUND",
+                         details=details, **kwargs)
+
+
+class BusinessLogicError(ForgeError):
+    """Raised when a business rule is violated."""
+
+    def __init__(self, message, rule_violation=None, **kwargs):
+        details = kwargs.pop('details', {})
+        if rule_violation:
+            details['rule_violation'] = rule_violation
+        super().__init__(message, error_code="BUSINESS_LOGIC_ERROR",
+                         details=details, **kwargs)
+
+
+class ExternalServiceError(ForgeError):
+    """Raised when an external service call fails."""
+
+    def __init__(self, message, service_name=None, endpoint=None, **kwargs):
+        details = kwargs.pop('details', {})
+        if service_name:
+            details['service_name'] = service_name
+        if endpoint:
+            details['endpoint'] = endpoint
+        super().__init__(message, error_code="EXTERNAL_SERVICE_ERROR",
+                         details=details, **kwargs)
+
+
+def handle_database_error(operation, error, table=None):
+    """Translate a low-level sqlite3 error into a DatabaseError with a
+    human-readable message."""
+    error_text = str(error)
+    if 'no such table' in error_text:
+        message = f"Table does not exist: {error_text}"
+    elif 'database is locked' in error_text:
+        message = "Database is locked - another operation is in progress"
+    elif 'UNIQUE constraint failed' in error_text:
+        message = f"Duplicate value violates unique constraint: {error_text}"
+    elif 'FOREIGN KEY constraint failed' in error_text:
+        message = "Operation violates referential integrity"
+    else:
+        message = f"Database operation failed: {error_text}"
+    return DatabaseError(message, operation=operation, table=table, cause=error)
+
+
+def handle_validation_error(field, value, validation_rule):
+    """Build a ValidationError describing why a field failed validation."""
+    error = ValidationError(
+        f"Validation failed for field '{field}': {validation_rule}",
+        field=field,
+        value=value,
+    )
+    error.details['validation_rule'] = validation_rule
+    return error
+
+
+def wrap_exception(cause=None, error_type=ForgeError, message=None):
+    """Wrap an arbitrary exception in a ForgeError subclass.
+
+    ForgeError instances are returned unchanged so error codes survive
+    re-raising across layers.
+    """
+    if isinstance(cause, ForgeError):
+        return cause
+    if message is None:
+        message = f"Operation failed: {cause}"
+    return error_type(message, cause=cause)
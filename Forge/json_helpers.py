@@ -0,0 +1,65 @@
+"""
+orjson-backed JSON responses.
+
+orjson serializes typical dict/list payloads several times faster than the
+stdlib encoder behind flask.jsonify; route modules use json_response() for
+their JSON endpoints.
+"""
+
+import sqlite3
+
+import orjson
+from flask import Response
+from flask.json.provider import JSONProvider
+
+
+def json_default(obj):
+    """orjson fallback: serialize sqlite3.Row as an object, else str().
+
+    Lets endpoints pass query_db rows straight to the encoder instead of
+    copying every row into a dict first.
+    """
+    if isinstance(obj, sqlite3.Row):
+        return dict(obj)
+    return str(obj)
+
+
+class OrjsonProvider(JSONProvider):
+    """App-wide JSON provider backed by orjson.
+
+    Installed on the app in app.py so the jsonify() calls in the route
+    modules (and flask-restx's marshalled responses) use the same fast
+    encoder as json_response().
+    """
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=json_default).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
+def json_response(obj, status=200):
+    """Serialize obj with orjson and wrap it in a JSON Response.
+
+    json_default covers sqlite3.Row, datetime and other non-native types.
+    """
+    return Response(orjson.dumps(obj, default=json_default),
+                    status=status, mimetype='application/json')
+
+
+def chunked_json_array(items):
+    """Yield a JSON array one element at a time.
+
+    Lets endpoints stream large row sets without materializing the whole
+    payload: one orjson pass per element instead of list + dicts + bytes.
+    """
+    yield b'['
+    first = True
+    for item in items:
+        if first:
+            first = False
+        else:
+            yield b','
+        yield orjson.dumps(item, default=json_default)
+    yield b']'
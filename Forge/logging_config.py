@@ -0,0 +1,176 @@
+"""
+Forge Logging Configuration
+Implements Commandment 3: Observability Is Not Optional
+
+Provides structured JSON logging, an audit trail for data-changing
+operations, and the GEE_DEBUG_MODE instrumentation used by manage.sh
+(`./manage.sh forge-debug`): function-call tracing and SQL query timing.
+"""
+
+import functools
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import time
+import uuid
+
+# Keys whose values must never be written to a log line.
+SENSITIVE_KEYS = {'password', 'passwd', 'secret', 'token', 'api_key',
+                  'secret_key', 'jwt_secret', 'dbPassword', 'DB_PASSWORD',
+                  'LINUX_PASSWORD', 'linuxPassword'}
+
+_configured = False
+
+
+def is_debug_mode():
+    """Return True when GEE_DEBUG_MODE is enabled in the environment."""
+    return os.environ.get('GEE_DEBUG_MODE', '').lower() in ('true', '1', 'yes', 'on')
+
+
+class JsonFormatter(logging.Formatter):
+    """Format log records as single-line JSON documents."""
+
+    def format(self, record):
+        log_entry = {
+            '@timestamp': self.formatTime(record, datefmt='%Y-%m-%dT%H:%M:%S'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in logging.LogRecord('', 0, '', 0, '', (), None).__dict__ \
+                    and key not in ('message', 'asctime'):
+                log_entry[key] = value
+        if record.exc_info:
+            log_entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(log_entry, default=str)
+
+
+def setup_logging(level=None):
+    """Configure root logging once. Debug mode lowers the level and adds a
+    separate debug log file under logs/."""
+    global _configured
+    if _configured:
+        return
+    if level is None:
+        level = logging.DEBUG if is_debug_mode() else logging.INFO
+
+    root = logging.getLogger()
+    root.setLevel(level)
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(JsonFormatter())
+    handlers = [stream_handler]
+
+    if is_debug_mode():
+        log_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'logs')
+        try:
+            os.makedirs(log_dir, exist_ok=True)
+            debug_handler = logging.FileHandler(os.path.join(log_dir, 'forge_debug.log'))
+            debug_handler.setFormatter(JsonFormatter())
+            debug_handler.setLevel(logging.DEBUG)
+            handlers.append(debug_handler)
+        except OSError:
+            pass  # read-only deployments still get stream logging
+
+    # Request threads only enqueue records; the listener thread does the
+    # actual stream/file writes, so logging never blocks a request on I/O.
+    log_queue = queue.Queue(-1)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    listener = logging.handlers.QueueListener(
+        log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+
+    _configured = True
+
+
+def get_logger(name):
+    """Return a named logger, configuring logging on first use."""
+    setup_logging()
+    return logging.getLogger(name)
+
+
+def _sanitize(value):
+    """Strip sensitive values from data that is about to be logged."""
+    if isinstance(value, dict):
+        return {k: ('***' if k in SENSITIVE_KEYS else _sanitize(v))
+                for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_sanitize(v) for v in value]
+    return value
+
+
+def audit_log(action, resource_type, resource_id, **context):
+    """Write an audit entry for a data-changing operation."""
+    logger = get_logger('forge.audit')
+    logger.info(
+        f"Audit: {action} {resource_type} {resource_id}",
+        extra={
+            'audit_action': action,
+            'resource_type': resource_type,
+            'resource_id': resource_id,
+            'correlation_id': uuid.uuid4().hex,
+            **_sanitize(context),
+        },
+    )
+
+
+def log_function_call(func):
+    """Decorator that traces function calls when debug mode is enabled."""
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not is_debug_mode():
+            return func(*args, **kwargs)
+
+        logger = get_logger('forge.debug.function_calls')
+        start = time.time()
+        try:
+            result = func(*args, **kwargs)
+            logger.debug(
+                f"Function call started: {func.__name__}",
+                extra={
+                    'function_name': func.__name__,
+                    'function_module': func.__module__,
+                    'input_args': _sanitize(list(args)),
+                    'input_kwargs': _sanitize(kwargs),
+                    'duration_ms': round((time.time() - start) * 1000, 2),
+                    'success': True,
+                },
+            )
+            return result
+        except Exception as e:
+            logger.debug(
+                f"Function call failed: {func.__name__}",
+                extra={
+                    'function_name': func.__name__,
+                    'function_module': func.__module__,
+                    'duration_ms': round((time.time() - start) * 1000, 2),
+                    'success': False,
+                    'error': str(e),
+                },
+                exc_info=True,
+            )
+            raise
+
+    return wrapper
+
+
+def log_sql_query(query, args, duration_ms, result_count=None):
+    """Log an executed SQL query when debug mode is enabled."""
+    if not is_debug_mode():
+        return
+    logger = get_logger('forge.debug.sql')
+    query_type = query.strip().split(None, 1)[0].upper() if query.strip() else 'UNKNOWN'
+    logger.debug(
+        "SQL query executed",
+        extra={
+            'sql_query': query,
+            'query_args_count': len(args) if args else 0,
+            'query_type': query_type,
+            'result_count': result_count,
+            'duration_ms': round(duration_ms, 2),
+        },
+    )
@@ -0,0 +1 @@
+"""Route blueprints for the Forge application."""
@@ -0,0 +1,1192 @@
+"""
+Database connectivity routes.
+
+Manages environments (GEE_ENVIRONMENTS), their database configurations
+(GEE_DATABASE_CONFIGS), the legacy flat config table (GEE_ENV_CONFIG) and
+the live connection handles handed to Praxis (GEE_ACTIVE_CONNECTIONS).
+"""
+
+import asyncio
+import functools
+import itertools
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import RLock
+from dataclasses import dataclass
+from datetime import datetime
+
+import orjson
+from cachetools import TTLCache
+from flask import (Blueprint, Response, current_app, request,
+                   render_template, stream_with_context)
+
+from db_helpers import get_db, query_db, modify_db, modify_db_many
+from json_helpers import chunked_json_array, json_response
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+def _static_error(message, status=400):
+    """Pre-serialize a fixed error payload; returns a zero-arg responder.
+
+    Invalid-payload probes hit these constantly; serializing once at
+    import skips orjson + dict construction on every rejection.
+    """
+    body = orjson.dumps({'success': False, 'message': message})
+
+    def responder():
+        return Response(body, status=status, mimetype='application/json')
+
+    return responder
+
+
+_err_no_data = _static_error('No data provided')
+_err_no_connections = _static_error('connections list is required')
+_err_no_runtime_id = _static_error('app_runtime_id is required')
+_err_no_handle = _static_error('handle and config_id are required')
+
+database_bp = Blueprint('database', __name__, url_prefix='/database')
+
+# Connection handles registered by this worker, keyed by handle. Bounded
+# and time-limited so long-running workers don't accumulate stale handles;
+# mutated from concurrent request threads, hence the lock.
+# Lock striping: handle registrations arrive from many probe threads at
+# once, so the registry is 16 independently locked TTL shards keyed by
+# hash(handle) instead of one cache behind one lock.
+_SHARD_BITS = 4
+_SHARD_COUNT = 1 << _SHARD_BITS
+_conn_shards = [(TTLCache(maxsize=10000 // _SHARD_COUNT, ttl=3600), RLock())
+                for _ in range(_SHARD_COUNT)]
+
+
+def _conn_shard(handle):
+    """Return the (cache, lock) shard owning a handle."""
+    return _conn_shards[hash(handle) & (_SHARD_COUNT - 1)]
+
+
+def _clear_conn_shards():
+    """Empty every shard (runtime-wide cleanup)."""
+    for cache, lock in _conn_shards:
+        with lock:
+            cache.clear()
+
+
+@dataclass(slots=True)
+class ActiveConn:
+    """In-memory record of a registered connection handle.
+
+    Slots keep each of the up-to-10k cached entries at a fraction of the
+    size of the dict literal this replaced.
+    """
+    handle: str
+    config_id: int = None
+    db_type: str = None
+    db_name: str = None
+    created: str = None
+    app_runtime_id: str = ''
+
+# Budget for a single connection test. Driver-level connect timeouts
+# (below) fast-fail unreachable hosts in ~5s, so the overall budget only
+# has to cover a slow-but-live handshake.
+TIMEOUT_SECONDS = 15
+CONNECT_TIMEOUT_SECONDS = 5
+
+# Required payload fields per database type, precomputed for the hot
+# validation path in the connection-test endpoints.
+REQUIRED_FIELDS = {
+    'SQLite': ('dbName',),
+    'Oracle': ('dbName', 'dbUsername', 'dbHost', 'dbPort'),
+    'Postgres': ('dbName', 'dbUsername', 'dbHost', 'dbPort'),
+    'MySQL': ('dbName', 'dbUsername', 'dbHost', 'dbPort'),
+}
+
+# Driver-side connection pools for the test path, keyed by
+# (host, port, user, database). Repeat tests against the same target reuse
+# a pooled connection instead of paying TCP+TLS+auth on every click.
+_POOL_LOCK = threading.Lock()
+_MAX_POOLS_PER_DRIVER = 16
+_pg_pools = OrderedDict()
+_oracle_pools = OrderedDict()
+_mysql_pools = OrderedDict()
+
+
+# Cached probe connections for SQLite paths. Opening the file is cheap but
+# repeated tests of the same saved config shouldn't reopen it every click.
+_sqlite_conns = {}
+
+
+# The working directory is fixed for the process lifetime (nothing in
+# Forge chdirs), so resolve it once instead of a getcwd() syscall per
+# SQLite test. Existence checks get a short TTL: repeated tests of the
+# same payload skip the stat() as well.
+_CWD = os.getcwd()
+_PATH_EXISTS = TTLCache(maxsize=256, ttl=10)
+_PATH_LOCK = threading.Lock()
+
+
+def _resolve_sqlite_path(db_path):
+    """Resolve a payload database path against the process working dir."""
+    if not os.path.isabs(db_path):
+        db_path = os.path.join(_CWD, db_path)
+    return db_path
+
+
+def _path_exists(path):
+    """os.path.exists with a 10s TTL cache."""
+    with _PATH_LOCK:
+        cached = _PATH_EXISTS.get(path)
+    if cached is not None:
+        return cached
+    exists = os.path.exists(path)
+    with _PATH_LOCK:
+        _PATH_EXISTS[path] = exists
+    return exists
+
+
+def _get_sqlite_conn(db_path):
+    """Return a cached probe connection for a SQLite file."""
+    with _POOL_LOCK:
+        conn = _sqlite_conns.get(db_path)
+        if conn is None:
+            conn = _sqlite_conns[db_path] = sqlite3.connect(
+                db_path, timeout=TIMEOUT_SECONDS, check_same_thread=False)
+        return conn
+
+
+def _pool_key(data, default_port):
+    """Identity of a pool: one pool per (host, port, user, database)."""
+    return (data.get('dbHost'), int(data.get('dbPort', default_port)),
+            data.get('dbUsername'), data['dbName'])
+
+
+def _close_pool(pool):
+    """Best-effort close across the drivers' pool APIs."""
+    try:
+        if hasattr(pool, 'closeall'):
+            pool.closeall()
+        elif hasattr(pool, 'close'):
+            pool.close()
+    except Exception:
+        pass
+
+
+def _get_pool(pools, key, factory):
+    """Fetch or create the pool for key, evicting least-recently-used pools
+    beyond the per-driver bound.
+
+    The factory opens real network connections and can block for the full
+    connect timeout, so it runs outside _POOL_LOCK; a concurrent request
+    for a different target is never stuck behind someone else's slow
+    connect. Losing a creation race just discards the extra pool.
+    """
+    with _POOL_LOCK:
+        pool = pools.get(key)
+        if pool is not None:
+            pools.move_to_end(key)
+            return pool
+
+    new_pool = factory()
+
+    evicted = []
+    with _POOL_LOCK:
+        pool = pools.get(key)
+        if pool is None:
+            pool = pools[key] = new_pool
+        else:
+            evicted.append(new_pool)
+        pools.move_to_end(key)
+        while len(pools) > _MAX_POOLS_PER_DRIVER:
+            _, old = pools.popitem(last=False)
+            evicted.append(old)
+    for old in evicted:
+        _close_pool(old)
+    return pool
+
+
+def get_pg_connection(data):
+    """Check a Postgres connection out of the pool for a test payload.
+
+    Returns (pool, connection); callers must pool.putconn(connection) when done.
+    """
+    from psycopg2.pool import ThreadedConnectionPool
+    key = _pool_key(data, 5432)
+    pool = _get_pool(_pg_pools, key, lambda: ThreadedConnectionPool(
+        1, 8,
+        host=data['dbHost'],
+        port=int(data.get('dbPort', 5432)),
+        user=data.get('dbUsername'),
+        password=data.get('dbPassword'),
+        dbname=data['dbName'],
+        connect_timeout=CONNECT_TIMEOUT_SECONDS,
+        # Keepalives reap half-open sockets instead of letting a dead
+        # pooled connection stall the next test for the whole budget.
+        keepalives=1,
+        keepalives_idle=30,
+        keepalives_interval=5,
+        keepalives_count=3,
+    ))
+    return pool, pool.getconn()
+
+
+def get_oracle_connection(data):
+    """Acquire an Oracle connection from the pool for a test payload.
+
+    Pooled connections return to the pool on close().
+    """
+    import oracledb
+    port = int(data.get('dbPort', 1521))
+    if data.get('oracleConnType', 'service') == 'sid':
+        dsn = oracledb.makedsn(data['dbHost'], port, sid=data['dbName'])
+    else:
+        dsn = oracledb.makedsn(data['dbHost'], port, service_name=data['dbName'])
+    key = _pool_key(data, 1521)
+    pool = _get_pool(_oracle_pools, key, lambda: oracledb.create_pool(
+        user=data.get('dbUsername'),
+        password=data.get('dbPassword'),
+        dsn=dsn,
+        min=1, max=8, increment=1,
+        tcp_connect_timeout=CONNECT_TIMEOUT_SECONDS,
+        # Send a keepalive probe every minute so idle pooled connections
+        # survive firewalls and dead peers are noticed early.
+        expire_time=1,
+    ))
+    return pool.acquire()
+
+
+def get_mysql_connection(data):
+    """Acquire a MySQL connection from the pool for a test payload.
+
+    Pooled connections return to the pool on close().
+    """
+    from mysql.connector.pooling import MySQLConnectionPool
+    key = _pool_key(data, 3306)
+    pool = _get_pool(_mysql_pools, key, lambda: MySQLConnectionPool(
+        pool_name=f"forge_{abs(hash(key)) % 10**8}",
+        pool_size=8,
+        host=data['dbHost'],
+        port=int(data.get('dbPort', 3306)),
+        user=data.get('dbUsername'),
+        password=data.get('dbPassword'),
+        database=data['dbName'],
+        connection_timeout=CONNECT_TIMEOUT_SECONDS,
+    ))
+    return pool.get_connection()
+
+
+# Oracle version banners are static per instance; cache them briefly so
+# repeat tests skip the V$VERSION round-trip.
+_ORACLE_META_TTL = 60
+_oracle_meta_lock = threading.Lock()
+_oracle_meta_cache = {}
+
+
+def _oracle_probe(conn, data):
+    """Return (server time, version banner) for a fresh Oracle connection.
+
+    Within the TTL only SYSDATE is fetched and the cached banner is reused.
+    """
+    key = (data.get('dbHost'), int(data.get('dbPort', 1521)), data['dbName'])
+    with _oracle_meta_lock:
+        cached = _oracle_meta_cache.get(key)
+    cursor = conn.cursor()
+    if cached and time.time() - cached[0] < _ORACLE_META_TTL:
+        cursor.execute("SELECT TO_CHAR(SYSDATE, 'YYYY-MM-DD HH24:MI:SS') FROM DUAL")
+        return cursor.fetchone()[0], cached[1]
+    cursor.execute(
+        "SELECT TO_CHAR(SYSDATE, 'YYYY-MM-DD HH24:MI:SS'), BANNER "
+        "FROM V$VERSION WHERE ROWNUM = 1")
+    sysdate, banner = cursor.fetchone()
+    with _oracle_meta_lock:
+        _oracle_meta_cache[key] = (time.time(), banner)
+    return sysdate, banner
+
+
+# Server version strings are static per target; cache them so repeat tests
+# skip the version query and only pay a cheap liveness check.
+_VERSION_CACHE = TTLCache(maxsize=512, ttl=3600)
+_VERSION_LOCK = threading.Lock()
+
+
+def _cached_version(db_type, data, fetch, ping=None):
+    """Return the target's version string, fetching it at most once per TTL.
+
+    On a cache hit the optional ping callable stands in as the liveness
+    signal instead of a full version round-trip.
+    """
+    key = (db_type, data.get('dbHost'), data.get('dbPort'), data['dbName'])
+    with _VERSION_LOCK:
+        version = _VERSION_CACHE.get(key)
+    if version is not None:
+        if ping is not None:
+            ping()
+        return version
+    version = fetch()
+    with _VERSION_LOCK:
+        _VERSION_CACHE[key] = version
+    return version
+
+
+def _fetch_pg_version(conn):
+    """One-shot version query on a pooled Postgres connection."""
+    cursor = conn.cursor()
+    cursor.execute('SELECT version()')
+    version = cursor.fetchone()[0]
+    cursor.close()
+    return version
+
+
+def _fetch_mysql_version(conn):
+    """One-shot version query on a pooled MySQL connection."""
+    cursor = conn.cursor()
+    cursor.execute('SELECT VERSION()')
+    version = cursor.fetchone()[0]
+    cursor.close()
+    return version
+
+
+# Single-pass replacement table for handle normalization; avoids the
+# intermediate strings of chained .replace() calls.
+_HANDLE_TR = str.maketrans({' ': '_', '-': '_'})
+
+
+@functools.lru_cache(maxsize=512)
+def _clean_handle_part(name):
+    """Normalize a name for use in a connection handle (cached: the same
+    env/display names recur on every test)."""
+    return name.lower().translate(_HANDLE_TR)[:20]
+
+
+@functools.lru_cache(maxsize=4096)
+def _saved_handle(db_type, db_config_id, env_name, db_display_name):
+    """Stable handle for a saved config; memoized since the same configs
+    are re-tested constantly."""
+    clean_env = _clean_handle_part(env_name)
+    clean_db = _clean_handle_part(db_display_name or '')
+    return f"{db_type.lower()}_{db_config_id}_{clean_env}_{clean_db}"
+
+
+def generate_connection_handle(db_type, env_name, db_display_name=None, db_config_id=None):
+    """Build the handle under which a connection is registered.
+
+    Saved configs get a stable handle so Praxis can re-resolve them; ad-hoc
+    tests get a unique temp handle.
+    """
+    if db_config_id:
+        return _saved_handle(db_type, db_config_id, env_name, db_display_name)
+
+    clean_env = _clean_handle_part(env_name)
+    clean_db = _clean_handle_part(db_display_name or 'default')
+    return f"{db_type.lower()}_temp_{clean_env}_{clean_db}_{uuid.uuid4().hex[:8]}"
+
+
+# Hot-path write statements as module constants. sqlite3 keeps a
+# per-connection prepared-statement cache keyed by SQL text
+# (cached_statements=256 in db_helpers.get_db); passing the same string
+# objects every call means parse+plan happens once per connection, not
+# once per test click.
+_SQL_UPDATE_LAST_TESTED = (
+    "UPDATE GEE_DATABASE_CONFIGS "
+    "SET LAST_TESTED = datetime('now', 'localtime') WHERE DB_CONFIG_ID = ?")
+_SQL_DELETE_BY_RUNTIME = (
+    "DELETE FROM GEE_ACTIVE_CONNECTIONS WHERE APP_RUNTIME_ID = ?")
+
+
+def update_last_tested(db_config_id):
+    """Stamp LAST_TESTED on a saved database config."""
+    try:
+        modify_db(_SQL_UPDATE_LAST_TESTED, (db_config_id,))
+    except Exception:
+        logger.exception(f"Error updating LAST_TESTED for config {db_config_id}")
+
+
+# The CREATED stamp is computed inside SQLite (localtime, to match the
+# format of existing rows) so callers no longer build a datetime and a
+# strftime string per write.
+_SQL_UPSERT_CONNECTION = (
+    "INSERT INTO GEE_ACTIVE_CONNECTIONS "
+    "(HANDLE, DB_CONFIG_ID, CONFIG_ID, CREATED, STATUS, APP_RUNTIME_ID) "
+    "VALUES (?, ?, ?, datetime('now', 'localtime'), 'active', ?) "
+    "ON CONFLICT(HANDLE) DO UPDATE SET "
+    "DB_CONFIG_ID = excluded.DB_CONFIG_ID, CONFIG_ID = excluded.CONFIG_ID, "
+    "STATUS = 'active', CREATED = datetime('now', 'localtime') "
+    "WHERE GEE_ACTIVE_CONNECTIONS.APP_RUNTIME_ID = excluded.APP_RUNTIME_ID "
+    "RETURNING HANDLE")
+
+
+def _upsert_connection(handle, db_config_id, config_id, app_runtime_id):
+    """Insert-or-refresh one handle row. Returns False when the handle
+    exists but belongs to a different runtime (the upsert is skipped)."""
+    db = get_db()
+    cur = db.execute(_SQL_UPSERT_CONNECTION,
+                     (handle, db_config_id, config_id, app_runtime_id))
+    row = cur.fetchone()
+    cur.close()
+    db.commit()
+    return row is not None
+
+
+def auto_store_connection_for_saved_config(handle, db_config_id, config_id, app_runtime_id):
+    """Register a successful test of a saved config in GEE_ACTIVE_CONNECTIONS.
+
+    The common path (new handle or re-test by the owning runtime) is a
+    single UPSERT; only a handle owned by another runtime needs a second
+    statement with a suffixed unique handle.
+    """
+    try:
+        if _upsert_connection(handle, db_config_id, config_id,
+                              app_runtime_id):
+            return handle
+        unique_handle = f"{handle}_{app_runtime_id[:8]}"
+        _upsert_connection(unique_handle, db_config_id, config_id,
+                           app_runtime_id)
+        return unique_handle
+    except Exception:
+        logger.exception(f"Error auto-storing connection for config {db_config_id}")
+        return handle
+
+
+@database_bp.route('/')
+def database_page():
+    """Render the database configuration page."""
+    return render_template('database.html')
+
+
+def _register_temp_handle(db_type, env_name, data, app_runtime_id):
+    """Record a successful ad-hoc test in the in-memory handle map."""
+    handle = generate_connection_handle(db_type, env_name)
+    cache, lock = _conn_shard(handle)
+    with lock:
+        cache[handle] = ActiveConn(
+            handle=handle,
+            db_type=db_type,
+            db_name=data['dbName'],
+            created=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            app_runtime_id=app_runtime_id,
+        )
+    return handle
+
+
+def _probe_sqlite(data, env_name, app_runtime_id):
+    """Probe an ad-hoc SQLite payload. Returns (result_dict, http_status)."""
+    try:
+        db_path = _resolve_sqlite_path(data['dbName'])
+        if not _path_exists(os.path.dirname(db_path) or '.'):
+            return ({'success': False,
+                     'message': f'Directory does not exist: {os.path.dirname(db_path)}'}, 404)
+        if not _path_exists(db_path):
+            return ({'success': False,
+                     'message': f'Database file not found: {db_path}'}, 404)
+        conn = _get_sqlite_conn(db_path)
+        version = _cached_version(
+            'SQLite', data,
+            fetch=lambda: conn.execute('SELECT sqlite_version()').fetchone()[0],
+            ping=lambda: conn.execute('SELECT 1').fetchone())
+        handle = _register_temp_handle('SQLite', env_name, data, app_runtime_id)
+        return ({'success': True,
+                 'message': f'Connected to SQLite {version}',
+                 'version': version,
+                 'handle': handle}, 200)
+    except Exception as e:
+        return ({'success': False,
+                 'message': f'SQLite connection failed: {str(e)}'}, 502)
+
+
+def _probe_oracle(data, env_name, app_runtime_id):
+    """Probe an ad-hoc Oracle payload. Returns (result_dict, http_status)."""
+    try:
+        conn = get_oracle_connection(data)
+        try:
+            banner = _cached_version('Oracle', data,
+                                     fetch=lambda: _oracle_probe(conn, data)[1],
+                                     ping=conn.ping)
+        finally:
+            conn.close()
+        handle = _register_temp_handle('Oracle', env_name, data, app_runtime_id)
+        return ({'success': True,
+                 'message': f'Connected to Oracle ({banner})',
+                 'version': banner,
+                 'handle': handle}, 200)
+    except Exception as e:
+        return ({'success': False,
+                 'message': f'Oracle connection failed: {str(e)}'}, 502)
+
+
+def _probe_postgres(data, env_name, app_runtime_id):
+    """Probe an ad-hoc Postgres payload. Returns (result_dict, http_status)."""
+    try:
+        pool, conn = get_pg_connection(data)
+        try:
+            version = _cached_version('Postgres', data,
+                                      fetch=lambda: _fetch_pg_version(conn))
+        finally:
+            pool.putconn(conn)
+        handle = _register_temp_handle('Postgres', env_name, data, app_runtime_id)
+        return ({'success': True,
+                 'message': f'Connected to {version}',
+                 'version': version,
+                 'handle': handle}, 200)
+    except Exception as e:
+        return ({'success': False,
+                 'message': f'Postgres connection failed: {str(e)}'}, 502)
+
+
+def _probe_mysql(data, env_name, app_runtime_id):
+    """Probe an ad-hoc MySQL payload. Returns (result_dict, http_status)."""
+    try:
+        conn = get_mysql_connection(data)
+        try:
+            version = _cached_version('MySQL', data,
+                                      fetch=lambda: _fetch_mysql_version(conn),
+                                      ping=conn.is_connected)
+        finally:
+            conn.close()
+        handle = _register_temp_handle('MySQL', env_name, data, app_runtime_id)
+        return ({'success': True,
+                 'message': f'Connected to MySQL {version} ({data["dbName"]})',
+                 'version': version,
+                 'handle': handle}, 200)
+    except Exception as e:
+        return ({'success': False,
+                 'message': f'MySQL connection failed: {str(e)}'}, 502)
+
+
+# O(1) dispatch over database types on the hot test path.
+PROBES = {
+    'SQLite': _probe_sqlite,
+    'Oracle': _probe_oracle,
+    'Postgres': _probe_postgres,
+    'MySQL': _probe_mysql,
+}
+
+
+def _test_connection_payload(data):
+    """Test connectivity for an ad-hoc (unsaved) connection payload.
+
+    Blocking; runs on the probe pool. Returns (result_dict, http_status).
+    """
+    db_type = data.get('dbType')
+
+    probe = PROBES.get(db_type)
+    if probe is None:
+        return ({'success': False,
+                 'message': f'Unsupported database type: {db_type}'}, 400)
+
+    required_fields = REQUIRED_FIELDS[db_type]
+    missing_fields = [f for f in required_fields if not data.get(f)]
+    if missing_fields:
+        return ({'success': False,
+                 'message': f"Missing required fields: {', '.join(missing_fields)}"}, 400)
+
+    return probe(data, data.get('envName', 'default'),
+                 data.get('app_runtime_id', ''))
+
+
+# Bounded pool for connection probes: a storm of slow/bad-config tests
+# saturates these 16 threads instead of the shared default executor, so the
+# rest of the app keeps serving.
+_probe_pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix='dbprobe')
+
+
+async def _run_test_with_timeout(payload):
+    """Run one blocking connection test off the loop, bounded by the budget.
+
+    Returns (result_dict, http_status).
+    """
+    future = asyncio.get_running_loop().run_in_executor(
+        _probe_pool, _test_connection_payload, payload)
+    try:
+        return await asyncio.wait_for(future, timeout=TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        future.cancel()
+        return ({'success': False,
+                 'message': f'Connection test timed out after {TIMEOUT_SECONDS}s'},
+                504)
+
+
+@database_bp.route('/test_connection', methods=['POST'])
+async def test_connection():
+    """Test connectivity for an ad-hoc (unsaved) connection payload."""
+    data = request.get_json()
+    if not data:
+        return _err_no_data()
+    result, status = await _run_test_with_timeout(data)
+    return json_response(result), status
+
+
+@database_bp.route('/test_connections_bulk', methods=['POST'])
+async def test_connections_bulk():
+    """Test many connection payloads concurrently ("test all" button).
+
+    The blocking driver handshakes overlap on the event loop, so wall time
+    approaches the slowest single test instead of the sum.
+    """
+    data = request.get_json()
+    if not data or not isinstance(data.get('connections'), list):
+        return _err_no_connections()
+    results = await asyncio.gather(
+        *(_run_test_with_timeout(payload) for payload in data['connections']))
+    return json_response({'success': True,
+                    'results': [result for result, _ in results]})
+
+
+# In-flight debounce for saved-config tests: concurrent identical requests
+# (UI double-clicks, parallel polling) attach to the first caller's Future
+# instead of each running a full handshake. Completed results are reusable
+# for a short window so rapid retries also coalesce.
+_INFLIGHT = {}
+_INFLIGHT_LOCK = threading.Lock()
+_RECENT_RESULTS = TTLCache(maxsize=256, ttl=0.5)
+
+
+def test_connection_internal(data):
+    """Test connectivity for a saved database config payload, coalescing
+    concurrent identical tests onto one backend attempt."""
+    key = (data.get('dbType'), data.get('dbConfigId'),
+           data.get('app_runtime_id'), data.get('dbHost'), data.get('dbPort'))
+    with _INFLIGHT_LOCK:
+        recent = _RECENT_RESULTS.get(key)
+        if recent is not None:
+            return recent.result(timeout=TIMEOUT_SECONDS)
+        future = _INFLIGHT.get(key)
+        leader = future is None
+        if leader:
+            future = _INFLIGHT[key] = Future()
+    if not leader:
+        return future.result(timeout=TIMEOUT_SECONDS)
+    try:
+        result = _do_test_internal(data)
+        future.set_result(result)
+        return result
+    except Exception as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _INFLIGHT_LOCK:
+            _INFLIGHT.pop(key, None)
+            _RECENT_RESULTS[key] = future
+
+
+def _handle_ctx(data):
+    """Extract the bookkeeping fields shared by every driver branch."""
+    return (data.get('envName', 'default'), data.get('dbDisplayName'),
+            data.get('dbConfigId'), data.get('configId'),
+            data.get('app_runtime_id', ''))
+
+
+def _success(db_type, version, message, ctx):
+    """Shared success tail: mint the handle, persist it for saved configs,
+    stamp LAST_TESTED, and build the response."""
+    env_name, db_display_name, db_config_id, config_id, app_runtime_id = ctx
+    handle = generate_connection_handle(db_type, env_name, db_display_name,
+                                        db_config_id)
+    if db_config_id:
+        handle = auto_store_connection_for_saved_config(
+            handle, db_config_id, config_id, app_runtime_id)
+        update_last_tested(db_config_id)
+    return json_response({'success': True,
+                    'message': message,
+                    'version': version,
+                    'handle': handle})
+
+
+def _do_test_internal(data):
+    """Test connectivity for a saved database config payload.
+
+    Shared by test_database_connection and the legacy environment test
+    endpoint. Returns a Flask response.
+    """
+    db_type = data.get('dbType')
+
+    required_fields = REQUIRED_FIELDS.get(db_type)
+    if required_fields is None:
+        return json_response({'success': False,
+                        'message': f'Unsupported database type: {db_type}'})
+
+    missing_fields = [f for f in required_fields if not data.get(f)]
+    if missing_fields:
+        return json_response({'success': False,
+                        'message': f"Missing required fields: {', '.join(missing_fields)}"})
+
+    ctx = _handle_ctx(data)
+
+    if db_type == 'SQLite':
+        try:
+            db_path = _resolve_sqlite_path(data['dbName'])
+            if not _path_exists(db_path):
+                return json_response({'success': False,
+                                'message': f'Database file not found: {db_path}'})
+            conn = _get_sqlite_conn(db_path)
+            version = _cached_version(
+                'SQLite', data,
+                fetch=lambda: conn.execute('SELECT sqlite_version()').fetchone()[0],
+                ping=lambda: conn.execute('SELECT 1').fetchone())
+            return _success(db_type, version,
+                            f'Connected to SQLite {version}', ctx)
+        except Exception as e:
+            return json_response({'success': False,
+                            'message': f'SQLite connection failed: {str(e)}'})
+
+    if db_type == 'Oracle':
+        try:
+            conn = get_oracle_connection(data)
+            try:
+                banner = _cached_version('Oracle', data,
+                                         fetch=lambda: _oracle_probe(conn, data)[1],
+                                         ping=conn.ping)
+            finally:
+                conn.close()
+            return _success(db_type, banner,
+                            f'Connected to Oracle ({banner})', ctx)
+        except Exception as e:
+            return json_response({'success': False,
+                            'message': f'Oracle connection failed: {str(e)}'})
+
+    if db_type == 'Postgres':
+        try:
+            pool, conn = get_pg_connection(data)
+            try:
+                version = _cached_version('Postgres', data,
+                                          fetch=lambda: _fetch_pg_version(conn))
+            finally:
+                pool.putconn(conn)
+            return _success(db_type, version, f'Connected to {version}', ctx)
+        except Exception as e:
+            return json_response({'success': False,
+                            'message': f'Postgres connection failed: {str(e)}'})
+
+    try:
+        conn = get_mysql_connection(data)
+        try:
+            version = _cached_version('MySQL', data,
+                                      fetch=lambda: _fetch_mysql_version(conn),
+                                      ping=conn.is_connected)
+        finally:
+            conn.close()
+        return _success(db_type, version,
+                        f'Connected to MySQL {version} ({data["dbName"]})', ctx)
+    except Exception as e:
+        return json_response({'success': False,
+                        'message': f'MySQL connection failed: {str(e)}'})
+
+
+# Saved configs change rarely but are tested constantly; cache the
+# config+environment lookup briefly and invalidate on config mutation.
+_CFG_CACHE = TTLCache(maxsize=1024, ttl=60)
+_CFG_LOCK = threading.Lock()
+
+
+def _get_db_config_cached(db_config_id):
+    """Resolve a saved config (with its environment name) through the
+    short TTL cache."""
+    with _CFG_LOCK:
+        if db_config_id in _CFG_CACHE:
+            return _CFG_CACHE[db_config_id]
+    config = query_db(
+        "SELECT dc.*, e.ENV_NAME FROM GEE_DATABASE_CONFIGS dc "
+        "JOIN GEE_ENVIRONMENTS e ON e.ENV_ID = dc.ENV_ID "
+        "WHERE dc.DB_CONFIG_ID = ?",
+        (db_config_id,), one=True,
+    )
+    if config is not None:
+        with _CFG_LOCK:
+            _CFG_CACHE[db_config_id] = config
+    return config
+
+
+def _invalidate_config_cache(db_config_id=None, env_id=None):
+    """Drop cached configs after a mutation (one id, or all for an env)."""
+    with _CFG_LOCK:
+        if db_config_id is not None:
+            _CFG_CACHE.pop(db_config_id, None)
+        elif env_id is not None:
+            _CFG_CACHE.clear()
+
+
+@database_bp.route('/test_database_connection/<int:db_config_id>', methods=['POST'])
+async def test_database_connection(db_config_id):
+    """Test a saved database config by id.
+
+    The blocking driver handshake runs on the probe pool (inside a fresh
+    app context for this thread's db connection) so the worker's event
+    loop stays free to serve other requests meanwhile.
+    """
+    config = _get_db_config_cached(db_config_id)
+    if not config:
+        return json_response({'success': False,
+                        'message': f'Database config {db_config_id} not found'}), 404
+
+    body = request.get_json(silent=True) or {}
+    data = {
+        'dbType': config['DB_TYPE'],
+        'dbName': config['DB_NAME'],
+        'dbDisplayName': config['DB_DISPLAY_NAME'],
+        'dbHost': config['DB_HOST'],
+        'dbPort': config['DB_PORT'],
+        'dbUsername': config['DB_USERNAME'],
+        'dbPassword': config['DB_PASSWORD'],
+        'oracleConnType': config['ORACLE_CONN_TYPE'],
+        'envName': config['ENV_NAME'],
+        'dbConfigId': db_config_id,
+        'configId': config['ENV_ID'],
+        'app_runtime_id': body.get('app_runtime_id', ''),
+    }
+
+    app = current_app._get_current_object()
+
+    def run_test():
+        with app.app_context():
+            return test_connection_internal(data)
+
+    future = asyncio.get_running_loop().run_in_executor(_probe_pool, run_test)
+    try:
+        return await asyncio.wait_for(future, timeout=TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        future.cancel()
+        return json_response(
+            {'success': False,
+             'message': f'Connection test timed out after {TIMEOUT_SECONDS}s'},
+            504)
+
+
+@database_bp.route('/store_connection', methods=['POST'])
+def store_connection():
+    """Persist a connection handle reported by the UI."""
+    data = request.get_json()
+    if not data:
+        return _err_no_data()
+
+    handle = data.get('handle')
+    config_id = data.get('config_id')
+    app_runtime_id = data.get('app_runtime_id', '')
+    if not handle or config_id is None:
+        return _err_no_handle()
+
+    try:
+        # Single UPSERT instead of SELECT-then-INSERT/UPDATE (and no
+        # TOCTOU window between them); a handle owned by another runtime
+        # blocks the update, in which case we store under a suffixed one.
+        if not _upsert_connection(handle, None, config_id,
+                                  app_runtime_id):
+            handle = f"{handle}_{app_runtime_id[:8]}"
+            _upsert_connection(handle, None, config_id,
+                               app_runtime_id)
+        # No in-memory mirror: stored handles live in SQLite and the read
+        # path (get_active_connections) resolves them there in one JOIN.
+        # The shard registry only tracks ad-hoc temp handles, which are
+        # never persisted.
+        return json_response({'success': True, 'handle': handle})
+    except Exception as e:
+        logger.exception(f"Error storing connection {handle}")
+        return json_response({'success': False,
+                        'message': f'Failed to store connection: {str(e)}'})
+
+
+@database_bp.route('/cleanup_connections', methods=['POST'])
+def cleanup_connections():
+    """Drop all connection handles registered by a runtime."""
+    data = request.get_json()
+    if not data or not data.get('app_runtime_id'):
+        return _err_no_runtime_id()
+
+    app_runtime_id = data['app_runtime_id']
+    try:
+        modify_db_many([(_SQL_DELETE_BY_RUNTIME, (app_runtime_id,))])
+        _clear_conn_shards()
+        return json_response({'success': True})
+    except Exception as e:
+        logger.exception(f"Error cleaning up connections for {app_runtime_id}")
+        return json_response({'success': False,
+                        'message': f'Cleanup failed: {str(e)}'})
+
+
+# One joined statement for the polled connections endpoint: both the
+# saved-config resolution and the legacy GEE_ENV_CONFIG fallback ride
+# along as LEFT JOINs instead of one or two extra queries per row.
+_SQL_ACTIVE_WITH_NAMES = (
+    "SELECT ac.HANDLE, ac.CONFIG_ID, ac.CREATED, ac.STATUS, ac.DB_CONFIG_ID, "
+    "e.ENV_NAME, dc.DB_TYPE, dc.DB_DISPLAY_NAME, "
+    "ec.ENV_NAME AS LEG_ENV_NAME, ec.DB_TYPE AS LEG_DB_TYPE "
+    "FROM GEE_ACTIVE_CONNECTIONS ac "
+    "LEFT JOIN GEE_DATABASE_CONFIGS dc ON dc.DB_CONFIG_ID = ac.DB_CONFIG_ID "
+    "LEFT JOIN GEE_ENVIRONMENTS e ON e.ENV_ID = dc.ENV_ID "
+    "LEFT JOIN GEE_ENV_CONFIG ec ON ec.GT_ID = ac.CONFIG_ID "
+    "WHERE ac.APP_RUNTIME_ID = ?")
+
+
+@database_bp.route('/get_active_connections', methods=['GET'])
+def get_active_connections():
+    """List the active connection handles for a runtime with their
+    resolved environment / database names."""
+    app_runtime_id = request.args.get('app_runtime_id', '')
+    try:
+        result = []
+        # Positional unpacking: Row.__getitem__ by name scans the column
+        # list per access, which adds up at ten columns per row.
+        for (handle, config_id, created, status, db_config_id,
+             env_name, db_type, db_display_name,
+             leg_env_name, leg_db_type) in map(
+                tuple, query_db(_SQL_ACTIVE_WITH_NAMES, (app_runtime_id,))):
+            entry = {
+                'handle': handle,
+                'config_id': config_id,
+                'created': created,
+                'status': status,
+            }
+            if db_config_id:
+                if env_name is not None:
+                    entry['env_name'] = env_name
+                    entry['db_type'] = db_type
+                    entry['db_display_name'] = db_display_name
+            elif leg_env_name is not None:
+                entry['env_name'] = leg_env_name
+                entry['db_type'] = leg_db_type
+            result.append(entry)
+        # Ad-hoc temp handles live only in the shard registry (they are
+        # never persisted), so fold this worker's entries in alongside
+        # the stored rows.
+        for cache, lock in _conn_shards:
+            with lock:
+                conns = list(cache.values())
+            for conn in conns:
+                if conn.app_runtime_id != app_runtime_id:
+                    continue
+                result.append({
+                    'handle': conn.handle,
+                    'config_id': conn.config_id,
+                    'created': conn.created,
+                    'status': 'active',
+                    'db_type': conn.db_type,
+                    'db_name': conn.db_name,
+                })
+        return json_response({'success': True, 'connections': result})
+    except Exception as e:
+        logger.exception("Error getting active connections")
+        return json_response({'success': False,
+                        'message': f'Failed to get connections: {str(e)}'})
+
+
+# Column layout of the get_env_configs JOIN, split at the env/config
+# boundary so each row tuple can be unpacked with two zips instead of
+# fifteen sqlite3.Row __getitem__ lookups.
+_ENV_COLS = ('ENV_ID', 'ENV_NAME', 'ENV_TYPE', 'DESCRIPTION',
+             'CREATE_DATE', 'UPDATE_DATE')
+_DB_COLS = ('DB_CONFIG_ID', 'DB_NAME', 'DB_DISPLAY_NAME', 'DB_TYPE',
+            'DB_HOST', 'DB_PORT', 'DB_USERNAME', 'DB_PASSWORD',
+            'DB_INSTANCE', 'ORACLE_CONN_TYPE', 'IS_PRIMARY', 'STATUS',
+            'LAST_TESTED')
+_ENV_SPLIT = len(_ENV_COLS)
+
+
+@database_bp.route('/get_env_configs', methods=['GET'])
+def get_env_configs():
+    """Return every environment with its database configurations.
+
+    Streamed: each environment is serialized and flushed as it is built,
+    so the payload is never held in memory as list + dicts + JSON bytes.
+    """
+    try:
+        # One LEFT JOIN instead of a query per environment; rows arrive
+        # grouped by environment thanks to the ORDER BY. Rows are plain
+        # tuples so the unpack below is zip() over slices, not keyed
+        # Row access per column.
+        rows = [tuple(r) for r in query_db(
+            "SELECT e.ENV_ID, e.ENV_NAME, e.ENV_TYPE, e.DESCRIPTION, "
+            "e.CREATE_DATE, e.UPDATE_DATE, "
+            "dc.DB_CONFIG_ID, dc.DB_NAME, dc.DB_DISPLAY_NAME, dc.DB_TYPE, "
+            "dc.DB_HOST, dc.DB_PORT, dc.DB_USERNAME, dc.DB_PASSWORD, "
+            "dc.DB_INSTANCE, dc.ORACLE_CONN_TYPE, dc.IS_PRIMARY, dc.STATUS, "
+            "dc.LAST_TESTED "
+            "FROM GEE_ENVIRONMENTS e "
+            "LEFT JOIN GEE_DATABASE_CONFIGS dc ON dc.ENV_ID = e.ENV_ID "
+            "ORDER BY e.ENV_NAME, dc.IS_PRIMARY DESC, dc.DB_DISPLAY_NAME")]
+
+        def env_iter():
+            for env_id, group in itertools.groupby(rows, key=lambda r: r[0]):
+                group = list(group)
+                env_dict = dict(zip(_ENV_COLS, group[0][:_ENV_SPLIT]))
+                databases = []
+                for r in group:
+                    if r[_ENV_SPLIT] is None:  # LEFT JOIN miss: no configs
+                        continue
+                    db_dict = dict(zip(_DB_COLS, r[_ENV_SPLIT:]))
+                    db_dict['ENV_ID'] = env_id
+                    databases.append(db_dict)
+                env_dict['databases'] = databases
+                yield env_dict
+
+        resp = Response(
+            stream_with_context(chunked_json_array(env_iter())),
+            mimetype='application/json',
+        )
+        resp.headers['Cache-Control'] = 'private, max-age=10'
+        return resp
+    except Exception as e:
+        logger.exception("Error getting env configs")
+        return json_response({'success': False,
+                        'message': f'Failed to get environments: {str(e)}'})
+
+
+@database_bp.route('/add_environment', methods=['POST'])
+def add_environment():
+    """Create an environment."""
+    data = request.get_json()
+    if not data or not data.get('envName'):
+        return json_response({'success': False, 'message': 'envName is required'})
+    try:
+        env_id = modify_db(
+            "INSERT INTO GEE_ENVIRONMENTS (ENV_NAME, ENV_TYPE, DESCRIPTION) "
+            "VALUES (?, ?, ?)",
+            (data['envName'], data.get('envType', 'DEV'), data.get('description', '')),
+        )
+        return json_response({'success': True, 'env_id': env_id})
+    except Exception as e:
+        logger.exception("Error adding environment")
+        return json_response({'success': False,
+                        'message': f'Failed to add environment: {str(e)}'})
+
+
+@database_bp.route('/update_environment/<int:env_id>', methods=['PUT', 'POST'])
+def update_environment(env_id):
+    """Update an environment's name/type/description."""
+    data = request.get_json()
+    if not data:
+        return json_response({'success': False, 'message': 'No data provided'})
+    now_iso = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    try:
+        modify_db(
+            "UPDATE GEE_ENVIRONMENTS SET ENV_NAME = ?, ENV_TYPE = ?, "
+            "DESCRIPTION = ?, UPDATE_DATE = ? WHERE ENV_ID = ?",
+            (data.get('envName'), data.get('envType', 'DEV'),
+             data.get('description', ''), now_iso, env_id),
+        )
+        _invalidate_config_cache(env_id=env_id)
+        return json_response({'success': True})
+    except Exception as e:
+        logger.exception(f"Error updating environment {env_id}")
+        return json_response({'success': False,
+                        'message': f'Failed to update environment: {str(e)}'})
+
+
+@database_bp.route('/delete_environment/<int:env_id>', methods=['DELETE', 'POST'])
+def delete_environment(env_id):
+    """Delete an environment and its database configs."""
+    try:
+        # Child configs go via the FK's ON DELETE CASCADE in one statement.
+        modify_db("DELETE FROM GEE_ENVIRONMENTS WHERE ENV_ID = ?", (env_id,))
+        _invalidate_config_cache(env_id=env_id)
+        return json_response({'success': True})
+    except Exception as e:
+        logger.exception(f"Error deleting environment {env_id}")
+        return json_response({'success': False,
+                        'message': f'Failed to delete environment: {str(e)}'})
+
+
+@database_bp.route('/add_database_config', methods=['POST'])
+def add_database_config():
+    """Add a database configuration to an environment.
+
+    The first database of an environment becomes primary automatically;
+    explicitly flagging one as primary demotes the previous primary.
+    """
+    data = request.get_json()
+    if not data or not data.get('envId') or not data.get('dbName'):
+        return json_response({'success': False,
+                        'message': 'envId and dbName are required'})
+    try:
+        env_id = data['envId']
+        want_primary = 1 if data.get('isPrimary') else 0
+        # One transaction instead of COUNT + UPDATE + INSERT: the demote
+        # is a no-op unless the caller asked for primary, and the INSERT
+        # computes "first config in env becomes primary" in SQL.
+        db_config_id = modify_db_many([
+            ("UPDATE GEE_DATABASE_CONFIGS SET IS_PRIMARY = 0 "
+             "WHERE ENV_ID = ? AND ? = 1",
+             (env_id, want_primary)),
+            ("INSERT INTO GEE_DATABASE_CONFIGS "
+             "(ENV_ID, DB_NAME, DB_DISPLAY_NAME, DB_TYPE, DB_HOST, DB_PORT, "
+             "DB_USERNAME, DB_PASSWORD, DB_INSTANCE, ORACLE_CONN_TYPE, IS_PRIMARY) "
+             "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, "
+             "MAX(?, CASE WHEN EXISTS (SELECT 1 FROM GEE_DATABASE_CONFIGS "
+             "WHERE ENV_ID = ?) THEN 0 ELSE 1 END))",
+             (env_id, data['dbName'], data.get('dbDisplayName', data['dbName']),
+              data.get('dbType', 'SQLite'), data.get('dbHost'),
+              data.get('dbPort'), data.get('dbUsername'), data.get('dbPassword'),
+              data.get('dbInstance'), data.get('oracleConnType', 'service'),
+              want_primary, env_id)),
+        ])
+        return json_response({'success': True, 'db_config_id': db_config_id})
+    except Exception as e:
+        logger.exception("Error adding database config")
+        return json_response({'success': False,
+                        'message': f'Failed to add database config: {str(e)}'})
+
+
+@database_bp.route('/update_database_config/<int:db_config_id>', methods=['PUT', 'POST'])
+def update_database_config(db_config_id):
+    """Update a saved database configuration."""
+    data = request.get_json()
+    if not data:
+        return json_response({'success': False, 'message': 'No data provided'})
+    now_iso = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    try:
+        modify_db(
+            "UPDATE GEE_DATABASE_CONFIGS SET DB_NAME = ?, DB_DISPLAY_NAME = ?, "
+            "DB_TYPE = ?, DB_HOST = ?, DB_PORT = ?, DB_USERNAME = ?, "
+            "DB_PASSWORD = ?, DB_INSTANCE = ?, ORACLE_CONN_TYPE = ?, "
+            "UPDATE_DATE = ? WHERE DB_CONFIG_ID = ?",
+            (data.get('dbName'), data.get('dbDisplayName'),
+             data.get('dbType'), data.get('dbHost'), data.get('dbPort'),
+             data.get('dbUsername'), data.get('dbPassword'),
+             data.get('dbInstance'), data.get('oracleConnType', 'service'),
+             now_iso, db_config_id),
+        )
+        _invalidate_config_cache(db_config_id=db_config_id)
+        return json_response({'success': True})
+    except Exception as e:
+        logger.exception(f"Error updating database config {db_config_id}")
+        return json_response({'success': False,
+                        'message': f'Failed to update database config: {str(e)}'})
+
+
+@database_bp.route('/delete_database_config/<int:db_config_id>', methods=['DELETE', 'POST'])
+def delete_database_config(db_config_id):
+    """Delete a database config, promoting another to primary if needed."""
+    try:
+        db = get_db()
+        try:
+            db.execute('BEGIN IMMEDIATE')
+            cur = db.execute(
+                "DELETE FROM GEE_DATABASE_CONFIGS WHERE DB_CONFIG_ID = ? "
+                "RETURNING ENV_ID, IS_PRIMARY",
+                (db_config_id,),
+            )
+            deleted = cur.fetchone()
+            cur.close()
+            if deleted is None:
+                db.rollback()
+                return json_response({'success': False,
+                                'message': f'Database config {db_config_id} not found'}, 404)
+            if deleted['IS_PRIMARY']:
+                db.execute(
+                    "UPDATE GEE_DATABASE_CONFIGS SET IS_PRIMARY = 1 "
+                    "WHERE DB_CONFIG_ID = ("
+                    "  SELECT DB_CONFIG_ID FROM GEE_DATABASE_CONFIGS "
+                    "  WHERE ENV_ID = ? ORDER BY DB_CONFIG_ID LIMIT 1)",
+                    (deleted['ENV_ID'],),
+                )
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        _invalidate_config_cache(db_config_id=db_config_id)
+        return json_response({'success': True})
+    except Exception as e:
+        logger.exception(f"Error deleting database config {db_config_id}")
+        return json_response({'success': False,
+                        'message': f'Failed to delete database config: {str(e)}'})
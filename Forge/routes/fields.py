@@ -0,0 +1,611 @@
+"""
+Field and field-class routes.
+
+The plain blueprint endpoints back the Fields page UI; the flask-restx
+resources expose the same data as a documented API together with the
+Swagger field-mapping helpers used by the API test console.
+"""
+
+import gzip
+import hashlib
+import sys
+import threading
+from collections import defaultdict
+
+import orjson
+from cachetools import TTLCache
+from flask import Blueprint, Response, request, render_template, stream_with_context
+from flask_restx import Api, Resource, fields as restx_fields
+
+from db_helpers import (get_db, query_db, query_db_iter, modify_db,
+                        modify_db_returning)
+from json_helpers import chunked_json_array, json_default, json_response
+from logging_config import get_logger
+from swagger_helpers import validate_field_mapping_config, map_request_to_fields
+
+logger = get_logger(__name__)
+
+# Stay under SQLite's default 999 bound-parameter cap when building
+# IN-list statements.
+_SQLITE_MAX_VARS = 900
+
+# Only compress payloads big enough for the CPU cost to buy back wire
+# time; level 5 is the usual throughput/ratio sweet spot for JSON.
+_COMPRESS_MIN_BYTES = 1024
+_GZIP_LEVEL = 5
+
+
+# The class list is a small, slow-changing lookup table fetched on every
+# page load; cache the encoded response body. Field/class writes drop it
+# and the short TTL bounds staleness from writers outside this process.
+_CLASSES_BODY = TTLCache(maxsize=1, ttl=30)
+_CLASSES_LOCK = threading.Lock()
+
+
+def _field_classes_body():
+    """Return the cached orjson-encoded class list, rebuilding on miss."""
+    with _CLASSES_LOCK:
+        body = _CLASSES_BODY.get('body')
+    if body is None:
+        body = orjson.dumps(query_db(_SQL_ALL_CLASSES), default=json_default)
+        with _CLASSES_LOCK:
+            _CLASSES_BODY['body'] = body
+    return body
+
+
+def _invalidate_classes_cache():
+    """Drop the cached class list after a write."""
+    with _CLASSES_LOCK:
+        _CLASSES_BODY.pop('body', None)
+
+
+# Total row count for the default (unfiltered) get_fields page, so the
+# hottest render skips COUNT entirely; field writes drop it below.
+_FIELDS_TOTAL = TTLCache(maxsize=1, ttl=30)
+_TOTAL_LOCK = threading.Lock()
+
+
+def _fields_total():
+    """Return the cached COUNT(*) of GEE_FIELDS, refreshing on miss."""
+    with _TOTAL_LOCK:
+        total = _FIELDS_TOTAL.get('n')
+    if total is None:
+        total = query_db("SELECT COUNT(*) AS CNT FROM GEE_FIELDS",
+                         one=True)['CNT']
+        with _TOTAL_LOCK:
+            _FIELDS_TOTAL['n'] = total
+    return total
+
+
+def _invalidate_fields_total():
+    """Drop the cached field count after a write."""
+    with _TOTAL_LOCK:
+        _FIELDS_TOTAL.pop('n', None)
+
+
+# Field metadata for the mapping endpoints (validate/map/generate all
+# need the full class + field projections). Metadata changes rarely, so
+# a short-TTL cache replaces the two table scans per request.
+_META_CACHE = TTLCache(maxsize=1, ttl=30)
+_META_LOCK = threading.Lock()
+
+
+def _load_meta():
+    """Return (field_classes, fields) dict lists for the mapping helpers."""
+    with _META_LOCK:
+        meta = _META_CACHE.get('meta')
+    if meta is None:
+        # Intern the identifier columns once per load; the mapping
+        # validators intern the payload side, so membership checks hit
+        # pointer equality.
+        classes = [{'GFC_ID': r['GFC_ID'],
+                    'FIELD_CLASS_NAME': sys.intern(r['FIELD_CLASS_NAME'])}
+                   for r in query_db(
+                       "SELECT GFC_ID, FIELD_CLASS_NAME FROM GEE_FIELD_CLASSES")]
+        fields_rows = [{'GFC_ID': r['GFC_ID'],
+                        'GF_NAME': sys.intern(r['GF_NAME']),
+                        'GF_TYPE': r['GF_TYPE'],
+                        'GF_DESCRIPTION': r['GF_DESCRIPTION']}
+                       for r in query_db(
+                           "SELECT GFC_ID, GF_NAME, GF_TYPE, GF_DESCRIPTION "
+                           "FROM GEE_FIELDS")]
+        meta = (classes, fields_rows)
+        with _META_LOCK:
+            _META_CACHE['meta'] = meta
+    return meta
+
+
+def _invalidate_meta_cache():
+    """Drop the cached mapping metadata after a write."""
+    with _META_LOCK:
+        _META_CACHE.pop('meta', None)
+
+
+def _invalidate_field_caches():
+    """Drop every field-derived cache after a field or class write."""
+    _invalidate_classes_cache()
+    _invalidate_fields_total()
+    _invalidate_meta_cache()
+
+
+def _fts_prefix_query(term):
+    """Quote user input as a literal FTS5 prefix-phrase query."""
+    return '"' + term.replace('"', '""') + '"*'
+
+# Explicit projections instead of SELECT *: GEE_FIELD_CLASSES carries
+# wide API-spec columns (OPENAPI_SPEC, API_METADATA, ...) that the field
+# endpoints never return, and naming columns keeps row width stable if
+# the schema grows.
+_FIELD_COLS = (
+    "GF_ID, GFC_ID, GF_NAME, GF_TYPE, GF_SIZE, GF_PRECISION_SIZE, "
+    "GF_DEFAULT_VALUE, GF_DESCRIPTION, CREATE_DATE, UPDATE_DATE")
+_CLASS_COLS = (
+    "GFC_ID, FIELD_CLASS_NAME, CLASS_TYPE, PARENT_GFC_ID, DESCRIPTION, "
+    "CREATE_DATE, UPDATE_DATE")
+
+# Hot statements as module constants. sqlite3 keeps a per-connection
+# prepared-statement cache keyed by SQL text (cached_statements=256 in
+# db_helpers), so passing the same string objects on every request skips
+# the parse/plan phase; these are also shared between the blueprint
+# endpoints and the flask-restx resources below.
+_SQL_ALL_CLASSES = (
+    f"SELECT {_CLASS_COLS} FROM GEE_FIELD_CLASSES ORDER BY FIELD_CLASS_NAME")
+_SQL_FIELDS_BY_CLASS = (
+    f"SELECT {_FIELD_COLS} FROM GEE_FIELDS WHERE GFC_ID = ? ORDER BY GF_NAME")
+_SQL_CHILD_CLASSES = (
+    f"SELECT {_CLASS_COLS} FROM GEE_FIELD_CLASSES WHERE PARENT_GFC_ID = ? "
+    "ORDER BY FIELD_CLASS_NAME")
+_SQL_FIELD_BY_ID = f"SELECT {_FIELD_COLS} FROM GEE_FIELDS WHERE GF_ID = ?"
+_SQL_INSERT_FIELD = (
+    "INSERT INTO GEE_FIELDS (GFC_ID, GF_NAME, GF_TYPE, GF_SIZE, "
+    "GF_PRECISION_SIZE, GF_DEFAULT_VALUE, GF_DESCRIPTION) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?)")
+_SQL_UPDATE_FIELD = (
+    "UPDATE GEE_FIELDS SET GFC_ID = ?, GF_NAME = ?, GF_TYPE = ?, "
+    "GF_SIZE = ?, GF_PRECISION_SIZE = ?, GF_DEFAULT_VALUE = ?, "
+    "GF_DESCRIPTION = ?, UPDATE_DATE = CURRENT_TIMESTAMP WHERE GF_ID = ?")
+_SQL_DELETE_FIELD = "DELETE FROM GEE_FIELDS WHERE GF_ID = ?"
+# RETURNING variants hand the affected row back from the write itself,
+# sparing the Swagger endpoints a follow-up SELECT.
+_SQL_INSERT_FIELD_RETURNING = f"{_SQL_INSERT_FIELD} RETURNING {_FIELD_COLS}"
+_SQL_UPDATE_FIELD_RETURNING = f"{_SQL_UPDATE_FIELD} RETURNING {_FIELD_COLS}"
+
+fields_bp = Blueprint('fields', __name__, url_prefix='/fields')
+
+# The Api claims the blueprint root for its own GET-only endpoint, so
+# the blueprint mounts at /api with every resource under /fields —
+# otherwise the collection resource at /api/fields/ is shadowed and
+# 404s. Docs live at /api/docs.
+fields_api_bp = Blueprint('fields_api', __name__, url_prefix='/api')
+api = Api(fields_api_bp, doc='/docs',
+          title='GEE Fields API',
+          description='Field classes, fields and request mapping')
+
+field_model = api.model('Field', {
+    'GF_ID': restx_fields.Integer(readonly=True),
+    'GFC_ID': restx_fields.Integer,
+    'GF_NAME': restx_fields.String,
+    'GF_TYPE': restx_fields.String,
+    'GF_SIZE': restx_fields.Integer,
+    'GF_PRECISION_SIZE': restx_fields.Integer,
+    'GF_DEFAULT_VALUE': restx_fields.String,
+    'GF_DESCRIPTION': restx_fields.String,
+})
+
+field_input = api.model('FieldInput', {
+    'GFC_ID': restx_fields.Integer(required=True),
+    'GF_NAME': restx_fields.String(required=True),
+    'GF_TYPE': restx_fields.String(required=True),
+    'GF_SIZE': restx_fields.Integer,
+    'GF_PRECISION_SIZE': restx_fields.Integer,
+    'GF_DEFAULT_VALUE': restx_fields.String,
+    'GF_DESCRIPTION': restx_fields.String,
+})
+
+field_mapping_model = api.model('FieldMapping', {
+    'field_class': restx_fields.String(required=True),
+    'field_name': restx_fields.String(required=True),
+    'request_path': restx_fields.String(required=True),
+})
+
+mapping_request_model = api.model('MappingRequest', {
+    'field_mapping': restx_fields.Raw(required=True),
+    'sample_request': restx_fields.Raw(required=True),
+})
+
+mapping_validation_model = api.model('MappingValidation', {
+    'field_mapping': restx_fields.Raw(required=True),
+})
+
+
+@fields_bp.route('/')
+def fields_page():
+    """Render the fields management page."""
+    return render_template('fields.html')
+
+
+@fields_bp.route('/get_field_classes', methods=['GET'])
+def get_field_classes():
+    """List every field class."""
+    try:
+        return Response(_field_classes_body(), mimetype='application/json')
+    except Exception as e:
+        logger.exception("Error getting field classes")
+        return json_response({'error': str(e)}), 500
+
+
+@fields_bp.route('/get_fields', methods=['GET'])
+def get_fields():
+    """Paginated field listing with optional search and class filter."""
+    try:
+        page = int(request.args.get('page', 1))
+        per_page = int(request.args.get('per_page', 10))
+        search = request.args.get('search', '')
+        class_filter = request.args.get('class_filter', '')
+
+        where_clauses = []
+        params = []
+        if search:
+            # FTS5 probe instead of four leading-wildcard LIKEs (which
+            # scan the whole table on every keystroke).
+            where_clauses.append(
+                "f.GF_ID IN (SELECT rowid FROM GEE_FIELDS_FTS "
+                "WHERE GEE_FIELDS_FTS MATCH ?)")
+            params.append(_fts_prefix_query(search))
+        if class_filter:
+            where_clauses.append("f.GFC_ID = ?")
+            params.append(class_filter)
+
+        select_prefix = (
+            "SELECT f.GF_ID, f.GFC_ID, f.GF_NAME, f.GF_TYPE, f.GF_SIZE, "
+            "f.GF_PRECISION_SIZE, f.GF_DEFAULT_VALUE, f.GF_DESCRIPTION, "
+            "f.CREATE_DATE, f.UPDATE_DATE, "
+            "fc.FIELD_CLASS_NAME, fc.CLASS_TYPE")
+        from_order = (
+            " FROM GEE_FIELDS f "
+            "LEFT JOIN GEE_FIELD_CLASSES fc ON f.GFC_ID = fc.GFC_ID {where} "
+            "ORDER BY fc.FIELD_CLASS_NAME, f.GF_NAME LIMIT ? OFFSET ?")
+        limit_params = [per_page, (page - 1) * per_page]
+
+        if where_clauses:
+            # COUNT(*) OVER () returns the pre-LIMIT total on every row,
+            # so one query replaces the COUNT + data pair and the
+            # JOIN/WHERE are evaluated once.
+            where = 'WHERE ' + ' AND '.join(where_clauses)
+            rows = query_db(
+                select_prefix + ", COUNT(*) OVER () AS TOTAL_COUNT"
+                + from_order.format(where=where),
+                params + limit_params,
+            )
+            total = rows[0]['TOTAL_COUNT'] if rows else 0
+            field_dicts = []
+            for row in rows:
+                d = dict(row)
+                del d['TOTAL_COUNT']
+                field_dicts.append(d)
+        else:
+            # Default render: serve the total from the cached count so
+            # the window function (which forces a full scan before the
+            # LIMIT applies) never runs on the unfiltered path.
+            total = _fields_total()
+            field_dicts = query_db(select_prefix + from_order.format(where=''),
+                                   limit_params)
+
+        total_pages = (total + per_page - 1) // per_page
+        payload = orjson.dumps({
+            'fields': field_dicts,
+            'pagination': {
+                'total': total,
+                'pages': total_pages,
+                'current_page': page,
+                'per_page': per_page,
+                'has_next': page < total_pages,
+            },
+        }, default=json_default)
+
+        # Content-hash ETag: UIs polling the same page revalidate with a
+        # 304 instead of re-downloading identical rows.
+        etag = hashlib.blake2b(payload, digest_size=16).hexdigest()
+        if etag in request.if_none_match:
+            return Response(status=304)
+
+        body = payload
+        headers = {'ETag': etag, 'Vary': 'Accept-Encoding'}
+        if (len(payload) >= _COMPRESS_MIN_BYTES
+                and 'gzip' in (request.headers.get('Accept-Encoding') or '')):
+            body = gzip.compress(payload, _GZIP_LEVEL)
+            headers['Content-Encoding'] = 'gzip'
+        return Response(body, mimetype='application/json', headers=headers)
+    except Exception as e:
+        logger.exception("Error getting fields")
+        return json_response({'error': str(e)}), 500
+
+
+@fields_bp.route('/get_fields_by_class/<int:gfc_id>', methods=['GET'])
+def get_fields_by_class(gfc_id):
+    """List the fields of one field class."""
+    try:
+        rows = query_db_iter(_SQL_FIELDS_BY_CLASS, (gfc_id,))
+        return Response(stream_with_context(chunked_json_array(rows)),
+                        mimetype='application/json')
+    except Exception as e:
+        logger.exception(f"Error getting fields for class {gfc_id}")
+        return json_response({'error': str(e)}), 500
+
+
+@fields_bp.route('/get_child_classes/<int:gfc_id>', methods=['GET'])
+def get_child_classes(gfc_id):
+    """List the child classes nested under a field class."""
+    try:
+        rows = query_db_iter(_SQL_CHILD_CLASSES, (gfc_id,))
+        return Response(stream_with_context(chunked_json_array(rows)),
+                        mimetype='application/json')
+    except Exception as e:
+        logger.exception(f"Error getting child classes for {gfc_id}")
+        return json_response({'error': str(e)}), 500
+
+
+@fields_bp.route('/add_field', methods=['POST'])
+def add_field():
+    """Create a field."""
+    data = request.get_json()
+    if not data or not data.get('GF_NAME') or not data.get('GFC_ID'):
+        return json_response({'success': False,
+                        'message': 'GF_NAME and GFC_ID are required'})
+    try:
+        gf_id = modify_db(
+            _SQL_INSERT_FIELD,
+            (data['GFC_ID'], data['GF_NAME'], data.get('GF_TYPE', 'STRING'),
+             data.get('GF_SIZE'), data.get('GF_PRECISION_SIZE'),
+             data.get('GF_DEFAULT_VALUE'), data.get('GF_DESCRIPTION', '')),
+        )
+        _invalidate_field_caches()
+        return json_response({'success': True, 'gf_id': gf_id})
+    except Exception as e:
+        logger.exception("Error adding field")
+        return json_response({'success': False, 'message': str(e)})
+
+
+@fields_bp.route('/update_field', methods=['POST', 'PUT'])
+def update_field():
+    """Update a field."""
+    data = request.get_json()
+    if not data or not data.get('GF_ID'):
+        return json_response({'success': False, 'message': 'GF_ID is required'})
+    try:
+        modify_db(
+            _SQL_UPDATE_FIELD,
+            (data.get('GFC_ID'), data.get('GF_NAME'), data.get('GF_TYPE'),
+             data.get('GF_SIZE'), data.get('GF_PRECISION_SIZE'),
+             data.get('GF_DEFAULT_VALUE'), data.get('GF_DESCRIPTION', ''),
+             data['GF_ID']),
+        )
+        _invalidate_field_caches()
+        return json_response({'success': True})
+    except Exception as e:
+        logger.exception("Error updating field")
+        return json_response({'success': False, 'message': str(e)})
+
+
+@fields_bp.route('/delete_field/<int:gf_id>', methods=['DELETE', 'POST'])
+def delete_field(gf_id):
+    """Delete a field."""
+    try:
+        modify_db(_SQL_DELETE_FIELD, (gf_id,))
+        _invalidate_field_caches()
+        return json_response({'success': True})
+    except Exception as e:
+        logger.exception(f"Error deleting field {gf_id}")
+        return json_response({'success': False, 'message': str(e)})
+
+
+@fields_bp.route('/bulk_delete_fields', methods=['POST'])
+def bulk_delete_fields():
+    """Delete a list of fields by id."""
+    data = request.get_json()
+    field_ids = data.get('field_ids', []) if data else []
+    if not field_ids:
+        return json_response({'success': False, 'message': 'field_ids is required'})
+    try:
+        # One IN-list DELETE ... RETURNING per chunk in a single
+        # transaction instead of a SELECT + DELETE pair per id; the
+        # returned ids both verify existence and give the deleted count.
+        db = get_db()
+        deleted_count = 0
+        try:
+            db.execute('BEGIN IMMEDIATE')
+            for i in range(0, len(field_ids), _SQLITE_MAX_VARS):
+                chunk = field_ids[i:i + _SQLITE_MAX_VARS]
+                placeholders = ','.join('?' * len(chunk))
+                cur = db.execute(
+                    f"DELETE FROM GEE_FIELDS WHERE GF_ID IN ({placeholders}) "
+                    f"RETURNING GF_ID",
+                    chunk)
+                deleted_count += len(cur.fetchall())
+                cur.close()
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        _invalidate_field_caches()
+        return json_response({'success': True, 'deleted_count': deleted_count})
+    except Exception as e:
+        logger.exception("Error bulk deleting fields")
+        return json_response({'success': False, 'message': str(e)})
+
+
+@api.route('/fields/classes')
+class FieldClassesAPI(Resource):
+    """Field classes together with their fields."""
+
+    def get(self):
+        # Two fixed queries instead of one fields query per class: fetch
+        # everything once and group in Python, so the round-trip count no
+        # longer scales with the number of classes.
+        by_class = defaultdict(list)
+        for f in query_db(
+                f"SELECT {_FIELD_COLS} FROM GEE_FIELDS ORDER BY GF_NAME"):
+            by_class[f['GFC_ID']].append(dict(f))
+        result = []
+        for field_class in query_db(_SQL_ALL_CLASSES):
+            class_dict = dict(field_class)
+            class_dict['fields'] = by_class.get(field_class['GFC_ID'], [])
+            result.append(class_dict)
+        return result
+
+
+@api.route('/fields', '/fields/')
+class FieldsSwaggerAPI(Resource):
+    """Field collection."""
+
+    @api.doc(model=[field_model])
+    def get(self):
+        # Stream the unpaginated collection row by row instead of
+        # marshalling the whole table into memory first; the projection
+        # matches field_model, so the payload shape is unchanged.
+        rows = query_db_iter(
+            "SELECT GF_ID, GFC_ID, GF_NAME, GF_TYPE, GF_SIZE, "
+            "GF_PRECISION_SIZE, GF_DEFAULT_VALUE, GF_DESCRIPTION "
+            "FROM GEE_FIELDS ORDER BY GF_NAME")
+        return Response(stream_with_context(chunked_json_array(rows)),
+                        mimetype='application/json')
+
+    @api.expect(field_input)
+    def post(self):
+        data = request.get_json()
+        rows = modify_db_returning(
+            _SQL_INSERT_FIELD_RETURNING,
+            (data.get('GFC_ID'), data.get('GF_NAME'), data.get('GF_TYPE'),
+             data.get('GF_SIZE'), data.get('GF_PRECISION_SIZE'),
+             data.get('GF_DEFAULT_VALUE'), data.get('GF_DESCRIPTION', '')),
+        )
+        _invalidate_field_caches()
+        return dict(rows[0]), 201
+
+
+@api.route('/fields/<int:gf_id>')
+class FieldSwaggerAPI(Resource):
+    """Single field."""
+
+    def get(self, gf_id):
+        row = query_db(_SQL_FIELD_BY_ID, (gf_id,), one=True)
+        if not row:
+            api.abort(404, f"Field {gf_id} not found")
+        return dict(row)
+
+    @api.expect(field_input)
+    def put(self, gf_id):
+        data = request.get_json()
+        rows = modify_db_returning(
+            _SQL_UPDATE_FIELD_RETURNING,
+            (data.get('GFC_ID'), data.get('GF_NAME'), data.get('GF_TYPE'),
+             data.get('GF_SIZE'), data.get('GF_PRECISION_SIZE'),
+             data.get('GF_DEFAULT_VALUE'), data.get('GF_DESCRIPTION', ''),
+             gf_id),
+        )
+        _invalidate_field_caches()
+        if not rows:
+            api.abort(404, f"Field {gf_id} not found")
+        return dict(rows[0])
+
+    def delete(self, gf_id):
+        modify_db(_SQL_DELETE_FIELD, (gf_id,))
+        _invalidate_field_caches()
+        return {'success': True}
+
+
+@api.route('/fields/swagger_models')
+class SwaggerModelsAPI(Resource):
+    """Field classes rendered as OpenAPI component schemas."""
+
+    def get(self):
+        classes, fields_rows = _load_meta()
+        models = {}
+        for field_class in classes:
+            properties = {}
+            for f in fields_rows:
+                if f['GFC_ID'] == field_class['GFC_ID']:
+                    properties[f['GF_NAME']] = {
+                        'type': (f['GF_TYPE'] or 'string').lower(),
+                        'description': f['GF_DESCRIPTION'] or '',
+                    }
+            models[field_class['FIELD_CLASS_NAME']] = {
+                'type': 'object',
+                'properties': properties,
+            }
+        return models
+
+
+@api.route('/fields/mapping')
+class FieldMappingAPI(Resource):
+    """Apply a field mapping config against a sample request payload."""
+
+    @api.expect(mapping_request_model)
+    def post(self):
+        data = request.get_json()
+        if not data or 'field_mapping' not in data:
+            return {'success': False, 'message': 'field_mapping is required'}, 400
+
+        field_classes, fields_rows = _load_meta()
+
+        is_valid, errors = validate_field_mapping_config(
+            data['field_mapping'], field_classes, fields_rows)
+        if not is_valid:
+            return {'success': False, 'errors': errors}, 400
+
+        resolved = map_request_to_fields(
+            data.get('sample_request', {}), data['field_mapping'])
+        return {'success': True, 'mapped_fields': resolved}
+
+
+@api.route('/fields/mapping/validate')
+class ValidateMappingAPI(Resource):
+    """Validate a field mapping config without applying it."""
+
+    @api.expect(mapping_validation_model)
+    def post(self):
+        data = request.get_json()
+        if not data or 'field_mapping' not in data:
+            return {'success': False, 'message': 'field_mapping is required'}, 400
+
+        field_classes, fields_rows = _load_meta()
+
+        is_valid, errors = validate_field_mapping_config(
+            data['field_mapping'], field_classes, fields_rows)
+        return {'success': is_valid, 'errors': errors}
+
+
+@api.route('/fields/mapping/generate/<int:gfc_id>')
+class GenerateMappingAPI(Resource):
+    """Generate a starter mapping config for a field class."""
+
+    def get(self, gfc_id):
+        field_class = query_db(
+            "SELECT GFC_ID, FIELD_CLASS_NAME FROM GEE_FIELD_CLASSES "
+            "WHERE GFC_ID = ?",
+            (gfc_id,), one=True,
+        )
+        if not field_class:
+            api.abort(404, f"Field class {gfc_id} not found")
+
+        class_fields = query_db(_SQL_FIELDS_BY_CLASS, (gfc_id,))
+        # Derive the key/path prefixes from the class name once; the
+        # loop then only concatenates, instead of re-lowercasing and
+        # re-formatting the same name per field.
+        cname = field_class['FIELD_CLASS_NAME']
+        key_prefix = cname + '_'
+        path_prefix = cname.lower() + '.'
+        mapping = {}
+        sample_request = {}
+        for f in class_fields:
+            name = f['GF_NAME']
+            mapping[key_prefix + name + '_mapping'] = {
+                'field_class': cname,
+                'field_name': name,
+                'request_path': path_prefix + name,
+            }
+            sample_request[name] = '<' + (f['GF_TYPE'] or 'string').lower() + '>'
+        return {
+            'field_mapping': mapping,
+            'sample_request': {path_prefix[:-1]: sample_request},
+        }
@@ -0,0 +1,197 @@
+"""
+Flow designer routes.
+
+Persists the canvas state of the visual flow editor: GEE_FLOWS for the
+header row, GEE_FLOW_NODES / GEE_FLOW_CONNECTIONS for the graph and
+GEE_FLOW_VERSIONS for full JSON snapshots of every save.
+"""
+
+import hashlib
+from datetime import datetime
+
+import orjson
+from flask import Blueprint, Response, request, jsonify, render_template
+
+from db_helpers import query_db, transaction
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+flow_designer_bp = Blueprint('flow_designer', __name__, url_prefix='/flow-designer')
+
+
+def _table_etag(table):
+    """Cheap change marker for a list endpoint's backing table.
+
+    Max timestamps + row count pick up every insert, update and delete,
+    so polling frontends revalidate with a 304 instead of re-fetching
+    and re-encoding unchanged rows.
+    """
+    meta = query_db(
+        f"SELECT MAX(UPDATE_DATE) AS U, MAX(CREATE_DATE) AS C, "
+        f"COUNT(*) AS N FROM {table}", one=True)
+    raw = f"{meta['U']}-{meta['C']}-{meta['N']}".encode()
+    return hashlib.blake2b(raw, digest_size=8).hexdigest()
+
+
+@flow_designer_bp.route('/')
+def flow_designer_page():
+    """Render the flow designer canvas."""
+    return render_template('flow_designer.html')
+
+
+@flow_designer_bp.route('/get_flows', methods=['GET'])
+def get_flows():
+    """List all flows."""
+    try:
+        etag = _table_etag('GEE_FLOWS')
+        if etag in request.if_none_match:
+            return Response(status=304, headers={'ETag': etag})
+        flows = query_db(
+            "SELECT FLOW_ID, FLOW_NAME, DESCRIPTION, VERSION, STATUS, "
+            "CREATE_DATE, UPDATE_DATE FROM GEE_FLOWS ORDER BY FLOW_NAME")
+        # The orjson provider serializes Row objects directly.
+        response = jsonify(flows)
+        response.headers['ETag'] = etag
+        return response
+    except Exception as e:
+        logger.exception("Error getting flows")
+        return jsonify({'error': str(e)}), 500
+
+
+@flow_designer_bp.route('/get_flow/<int:flow_id>', methods=['GET'])
+def get_flow(flow_id):
+    """Return one flow with its nodes and connections."""
+    try:
+        flow = query_db(
+            "SELECT * FROM GEE_FLOWS WHERE FLOW_ID = ?", (flow_id,), one=True)
+        if not flow:
+            return jsonify({'error': f'Flow {flow_id} not found'}), 404
+
+        nodes = query_db(
+            "SELECT * FROM GEE_FLOW_NODES WHERE FLOW_ID = ?", (flow_id,))
+        connections = query_db(
+            "SELECT * FROM GEE_FLOW_CONNECTIONS WHERE FLOW_ID = ?", (flow_id,))
+
+        result = dict(flow)
+        result['nodes'] = nodes
+        result['connections'] = connections
+        return jsonify(result)
+    except Exception as e:
+        logger.exception(f"Error getting flow {flow_id}")
+        return jsonify({'error': str(e)}), 500
+
+
+@flow_designer_bp.route('/save_flow', methods=['POST'])
+def save_flow():
+    """Create or update a flow from the designer canvas state."""
+    data = request.get_json()
+    if not data or not data.get('flowName'):
+        return jsonify({'success': False, 'message': 'flowName is required'})
+
+    nodes = data.get('nodes', [])
+    connections = data.get('connections', [])
+    current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+    try:
+        flow_id = data.get('flowId')
+        # One transaction for the whole save: header, graph rewrite and
+        # version snapshot commit (and fsync) together, and a failure
+        # part-way leaves the previous version intact.
+        with transaction() as db:
+            if flow_id:
+                db.execute(
+                    "UPDATE GEE_FLOWS SET FLOW_NAME = ?, DESCRIPTION = ?, "
+                    "VERSION = VERSION + 1, UPDATE_DATE = ? WHERE FLOW_ID = ?",
+                    (data['flowName'], data.get('description', ''), current_time, flow_id),
+                )
+                db.execute("DELETE FROM GEE_FLOW_CONNECTIONS WHERE FLOW_ID = ?", (flow_id,))
+                db.execute("DELETE FROM GEE_FLOW_NODES WHERE FLOW_ID = ?", (flow_id,))
+            else:
+                flow_id = db.execute(
+                    "INSERT INTO GEE_FLOWS (FLOW_NAME, DESCRIPTION, VERSION, STATUS, "
+                    "CREATE_DATE) VALUES (?, ?, 1, 'DRAFT', ?)",
+                    (data['flowName'], data.get('description', ''), current_time),
+                ).lastrowid
+
+            # Insert all nodes in one executemany, then read the fresh
+            # NODE_IDs back to build the canvas id -> NODE_ID mapping for
+            # the connections. NODE_ID is the rowid, so the rows select
+            # back in insertion order and zip against the request's list.
+            node_id_map = {}
+            if nodes:
+                db.executemany(
+                    "INSERT INTO GEE_FLOW_NODES (FLOW_ID, NODE_TYPE, REFERENCE_ID, "
+                    "POSITION_X, POSITION_Y, WIDTH, HEIGHT, LABEL, CUSTOM_SETTINGS, "
+                    "CREATE_DATE) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [(flow_id, node.get('type', 'RULE_GROUP'), node.get('referenceId'),
+                      node.get('x', 0), node.get('y', 0),
+                      node.get('width', 150), node.get('height', 60),
+                      node.get('name', ''),
+                      orjson.dumps(node.get('settings', {})).decode(),
+                      current_time)
+                     for node in nodes],
+                )
+                new_ids = db.execute(
+                    "SELECT NODE_ID FROM GEE_FLOW_NODES WHERE FLOW_ID = ? "
+                    "ORDER BY NODE_ID", (flow_id,)).fetchall()
+                node_id_map = {node.get('id'): row['NODE_ID']
+                               for node, row in zip(nodes, new_ids)}
+
+            if connections:
+                db.executemany(
+                    "INSERT INTO GEE_FLOW_CONNECTIONS (FLOW_ID, SOURCE_NODE_ID, "
+                    "TARGET_NODE_ID, CONNECTION_TYPE, LABEL, CREATE_DATE) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    [(flow_id, node_id_map.get(conn.get('source')),
+                      node_id_map.get(conn.get('target')),
+                      conn.get('type', 'DEFAULT'), conn.get('label', ''), current_time)
+                     for conn in connections],
+                )
+
+            flow_data_json = orjson.dumps(
+                {'nodes': nodes, 'connections': connections}).decode()
+            db.execute(
+                "INSERT INTO GEE_FLOW_VERSIONS (FLOW_ID, VERSION_NUMBER, FLOW_DATA, "
+                "CREATE_DATE) VALUES (?, (SELECT VERSION FROM GEE_FLOWS WHERE FLOW_ID = ?), ?, ?)",
+                (flow_id, flow_id, flow_data_json, current_time),
+            )
+        return jsonify({'success': True, 'flow_id': flow_id})
+    except Exception as e:
+        logger.exception("Error saving flow")
+        return jsonify({'success': False, 'message': str(e)})
+
+
+@flow_designer_bp.route('/delete_flow/<int:flow_id>', methods=['DELETE', 'POST'])
+def delete_flow(flow_id):
+    """Delete a flow and all of its graph data."""
+    try:
+        # All four deletes commit together: one fsync, and no window
+        # where a flow exists without its graph (or vice versa).
+        with transaction() as db:
+            db.execute("DELETE FROM GEE_FLOW_CONNECTIONS WHERE FLOW_ID = ?", (flow_id,))
+            db.execute("DELETE FROM GEE_FLOW_NODES WHERE FLOW_ID = ?", (flow_id,))
+            db.execute("DELETE FROM GEE_FLOW_VERSIONS WHERE FLOW_ID = ?", (flow_id,))
+            db.execute("DELETE FROM GEE_FLOWS WHERE FLOW_ID = ?", (flow_id,))
+        return jsonify({'success': True})
+    except Exception as e:
+        logger.exception(f"Error deleting flow {flow_id}")
+        return jsonify({'success': False, 'message': str(e)})
+
+
+@flow_designer_bp.route('/get_palette_rule_groups', methods=['GET'])
+def get_palette_rule_groups():
+    """Rule groups available for dragging onto the canvas."""
+    try:
+        etag = _table_etag('GRG_RULE_GROUPS')
+        if etag in request.if_none_match:
+            return Response(status=304, headers={'ETag': etag})
+        groups = query_db(
+            "SELECT GRG_ID, GROUP_NAME, DESCRIPTION FROM GRG_RULE_GROUPS "
+            "ORDER BY GROUP_NAME")
+        response = jsonify(groups)
+        response.headers['ETag'] = etag
+        return response
+    except Exception as e:
+        logger.exception("Error getting palette rule groups")
+        return jsonify({'error': str(e)}), 500
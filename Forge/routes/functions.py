@@ -0,0 +1,403 @@
+"""
+Base function routes.
+
+CRUD for GEE_BASE_FUNCTIONS and GEE_BASE_FUNCTIONS_PARAMS — the library of
+callable functions that rule lines reference. Mutating endpoints validate
+input through validators.CreateFunctionSchema and emit audit records.
+"""
+
+import math
+import threading
+
+import orjson
+from cachetools import TTLCache
+from flask import Blueprint, Response, request, jsonify, render_template
+
+from db_helpers import query_db, modify_db, transaction
+from exceptions import ValidationError
+from json_helpers import json_default
+from logging_config import get_logger, audit_log
+from validators import CreateFunctionSchema, validate_with_schema
+
+logger = get_logger(__name__)
+
+# Schema construction walks the field declarations and compiles their
+# validators; load() is thread-safe, so one module-level instance serves
+# every request instead of rebuilding the schema per call.
+_create_function_schema = CreateFunctionSchema()
+
+functions_bp = Blueprint('functions', __name__, url_prefix='/functions')
+
+
+def _fts_prefix_query(term):
+    """Quote user input as a literal FTS5 prefix-phrase query."""
+    return '"' + term.replace('"', '""') + '"*'
+
+
+# Unfiltered row count for the default get_functions page; add/delete
+# drop it below so the hottest listing skips the COUNT scan.
+_FUNCTIONS_TOTAL = TTLCache(maxsize=1, ttl=30)
+_TOTAL_LOCK = threading.Lock()
+
+
+def _functions_total():
+    """Return the cached COUNT(*) of GEE_BASE_FUNCTIONS, refreshing on miss."""
+    with _TOTAL_LOCK:
+        total = _FUNCTIONS_TOTAL.get('n')
+    if total is None:
+        total = query_db("SELECT COUNT(*) AS CNT FROM GEE_BASE_FUNCTIONS",
+                         one=True)['CNT']
+        with _TOTAL_LOCK:
+            _FUNCTIONS_TOTAL['n'] = total
+    return total
+
+
+def _invalidate_functions_total():
+    """Drop the cached function count after a create or delete."""
+    with _TOTAL_LOCK:
+        _FUNCTIONS_TOTAL.pop('n', None)
+
+
+# Encoded response bodies for the unfiltered first page — the request
+# every visit to the functions screen issues. Function and parameter
+# writes drop it; the TTL bounds staleness from writers outside this
+# process.
+_PAGE1_BODY = TTLCache(maxsize=8, ttl=30)
+_PAGE1_LOCK = threading.Lock()
+
+
+def _invalidate_page1_body():
+    """Drop the cached first-page listing after any function write."""
+    with _PAGE1_LOCK:
+        _PAGE1_BODY.clear()
+
+
+@functions_bp.route('/')
+def functions_page():
+    """Render the functions maintenance page."""
+    return render_template('functions.html')
+
+
+@functions_bp.route('/get_functions', methods=['GET'])
+def get_functions():
+    """Paginated, searchable list of base functions."""
+    try:
+        page = int(request.args.get('page', 1))
+        per_page = int(request.args.get('per_page', 10))
+        search = request.args.get('search', '').strip()
+
+        page = max(page, 1)
+        per_page = min(max(per_page, 1), 100)
+        offset = (page - 1) * per_page
+
+        # Keyset cursor for deep pages: seeking past the last seen
+        # (FUNC_NAME, GBF_ID) uses idx_gbf_name_id directly instead of
+        # walking and discarding OFFSET rows.
+        after_name = request.args.get('after_name')
+        after_id = request.args.get('after_id', type=int)
+        use_cursor = after_name is not None and after_id is not None
+
+        where = ''
+        args = []
+        if search:
+            # FTS5 probe instead of leading-wildcard LIKEs over name and
+            # description; a numeric search additionally matches on id,
+            # preserving the old lookup-by-id behavior.
+            fts = ("f.GBF_ID IN (SELECT rowid FROM GEE_FUNCTIONS_FTS "
+                   "WHERE GEE_FUNCTIONS_FTS MATCH ?)")
+            args = [_fts_prefix_query(search)]
+            if search.isdigit():
+                where = f"WHERE ({fts} OR CAST(f.GBF_ID AS TEXT) LIKE ?)"
+                args.append(f'%{search}%')
+            else:
+                where = f"WHERE {fts}"
+
+        # The count is skippable (?with_total=0) and served from cache
+        # on the unfiltered path; it always covers the filtered set
+        # only — the cursor clause below narrows the data query, not
+        # the total.
+        with_total = request.args.get('with_total', '1') != '0'
+
+        # First-page fast path: the default listing every visit issues
+        # is served from the encoded-body cache without touching SQLite.
+        cache_key = None
+        if page == 1 and not search and not use_cursor:
+            cache_key = (per_page, with_total)
+            with _PAGE1_LOCK:
+                body = _PAGE1_BODY.get(cache_key)
+            if body is not None:
+                return Response(body, mimetype='application/json')
+
+        total = None
+        if with_total:
+            if search:
+                total_row = query_db(
+                    f"SELECT COUNT(*) AS CNT FROM GEE_BASE_FUNCTIONS f {where}",
+                    tuple(args), one=True)
+                total = total_row['CNT'] if total_row else 0
+            else:
+                total = _functions_total()
+
+        # Without a total, fetch one extra row: its presence answers
+        # has_next without any COUNT.
+        fetch_limit = per_page if with_total else per_page + 1
+        if use_cursor:
+            seek = "(f.FUNC_NAME, f.GBF_ID) > (?, ?)"
+            where = f"{where} AND {seek}" if where else f"WHERE {seek}"
+            args = args + [after_name, after_id]
+            tail_params = (fetch_limit,)
+            tail = "LIMIT ?"
+        else:
+            tail_params = (fetch_limit, offset)
+            tail = "LIMIT ? OFFSET ?"
+
+        # The trigger-maintained counts table replaces a correlated
+        # COUNT over the params table for every listed row, and the
+        # alias already carries the name the UI expects — the rows go
+        # to the encoder as-is, no per-row dict rewrite.
+        functions = query_db(
+            f"SELECT f.*, COALESCE(c.N, 0) AS ACTUAL_PARAM_COUNT "
+            f"FROM GEE_BASE_FUNCTIONS f "
+            f"LEFT JOIN GEE_FUNCTION_PARAM_COUNTS c ON c.GBF_ID = f.GBF_ID "
+            f"{where} "
+            f"ORDER BY f.FUNC_NAME, f.GBF_ID {tail}",
+            tuple(args) + tail_params)
+
+        if with_total:
+            pages = math.ceil(total / per_page) if total else 0
+            has_next = page < pages
+        else:
+            pages = None
+            has_next = len(functions) > per_page
+            functions = functions[:per_page]
+
+        # Cursor for the next page: pass these back as after_name /
+        # after_id to seek instead of paying OFFSET.
+        next_cursor = None
+        if len(functions) == per_page:
+            last = functions[-1]
+            next_cursor = {'after_name': last['FUNC_NAME'],
+                           'after_id': last['GBF_ID']}
+
+        body = orjson.dumps({
+            'functions': functions,
+            'pagination': {
+                'total': total,
+                'pages': pages,
+                'current_page': page,
+                'per_page': per_page,
+                'has_next': has_next,
+                'has_prev': page > 1,
+                'next_cursor': next_cursor,
+            },
+        }, default=json_default)
+        if cache_key is not None:
+            with _PAGE1_LOCK:
+                _PAGE1_BODY[cache_key] = body
+        return Response(body, mimetype='application/json')
+    except Exception as e:
+        logger.error(f"Error getting functions: {str(e)}")
+        return jsonify({'error': 'INTERNAL_ERROR', 'message': str(e)}), 500
+
+
+@functions_bp.route('/get_function/<int:gbf_id>', methods=['GET'])
+def get_function(gbf_id):
+    """Return a single base function by id."""
+    try:
+        function = query_db(
+            "SELECT * FROM GEE_BASE_FUNCTIONS WHERE GBF_ID = ?",
+            (gbf_id,), one=True)
+        if not function:
+            return jsonify({
+                'error': 'RESOURCE_NOT_FOUND',
+                'message': f'Function {gbf_id} not found',
+            }), 404
+        return jsonify(dict(function))
+    except Exception as e:
+        logger.error(f"Error getting function {gbf_id}: {str(e)}")
+        return jsonify({'error': 'INTERNAL_ERROR', 'message': str(e)}), 500
+
+
+@functions_bp.route('/add_function', methods=['POST'])
+def add_function():
+    """Create a base function after schema validation."""
+    try:
+        payload = request.get_json(silent=True)
+        data = validate_with_schema(_create_function_schema, payload or {})
+    except ValidationError as e:
+        return jsonify({'error': 'VALIDATION_ERROR', 'message': e.message}), 400
+
+    try:
+        modify_db(
+            "INSERT INTO GEE_BASE_FUNCTIONS (FUNC_NAME, PARAM_COUNT, DESCRIPTION) "
+            "VALUES (?, ?, ?)",
+            (data['functionName'], data['paramCount'], data.get('description', '')),
+        )
+        _invalidate_functions_total()
+        _invalidate_page1_body()
+        audit_log(
+            action="create",
+            resource_type="function",
+            resource_id=data['functionName'],
+            function_name=data['functionName'],
+            param_count=data['paramCount'],
+        )
+        return jsonify({'success': True, 'message': 'Function added successfully'})
+    except Exception as e:
+        logger.error(f"Error adding function: {str(e)}")
+        return jsonify({'error': 'DATABASE_ERROR', 'message': str(e)}), 500
+
+
+@functions_bp.route('/update_function/<int:gbf_id>', methods=['PUT', 'POST'])
+def update_function(gbf_id):
+    """Update a base function's name, param count or description."""
+    try:
+        payload = request.get_json(silent=True)
+        data = validate_with_schema(_create_function_schema, payload or {})
+    except ValidationError as e:
+        return jsonify({'error': 'VALIDATION_ERROR', 'message': e.message}), 400
+
+    try:
+        existing = query_db(
+            "SELECT GBF_ID FROM GEE_BASE_FUNCTIONS WHERE GBF_ID = ?",
+            (gbf_id,), one=True)
+        if not existing:
+            return jsonify({
+                'error': 'RESOURCE_NOT_FOUND',
+                'message': f'Function {gbf_id} not found',
+            }), 404
+        modify_db(
+            "UPDATE GEE_BASE_FUNCTIONS SET FUNC_NAME = ?, PARAM_COUNT = ?, "
+            "DESCRIPTION = ? WHERE GBF_ID = ?",
+            (data['functionName'], data['paramCount'],
+             data.get('description', ''), gbf_id),
+        )
+        _invalidate_page1_body()
+        audit_log(
+            action="update",
+            resource_type="function",
+            resource_id=data['functionName'],
+            function_name=data['functionName'],
+            param_count=data['paramCount'],
+        )
+        return jsonify({'success': True, 'message': 'Function updated successfully'})
+    except Exception as e:
+        logger.error(f"Error updating function {gbf_id}: {str(e)}")
+        return jsonify({'error': 'DATABASE_ERROR', 'message': str(e)}), 500
+
+
+@functions_bp.route('/delete_function/<int:gbf_id>', methods=['DELETE', 'POST'])
+def delete_function(gbf_id):
+    """Delete a base function unless rule lines still reference it."""
+    try:
+        # Existence probe instead of COUNT(*): the planner stops at the
+        # first matching rule line rather than counting them all.
+        in_use = query_db(
+            "SELECT 1 FROM GEE_RULE_LINES WHERE FUNCTION_ID = ? LIMIT 1",
+            (gbf_id,), one=True)
+        if in_use:
+            return jsonify({
+                'error': 'BUSINESS_LOGIC_ERROR',
+                'message': f"Function {gbf_id} is still used by rule line(s)",
+            }), 409
+
+        # Params and function row go in one transaction: one fsync, and
+        # no crash window that leaves orphaned param rows.
+        with transaction() as db:
+            db.execute("DELETE FROM GEE_BASE_FUNCTIONS_PARAMS WHERE GBF_ID = ?",
+                       (gbf_id,))
+            db.execute("DELETE FROM GEE_BASE_FUNCTIONS WHERE GBF_ID = ?",
+                       (gbf_id,))
+        _invalidate_functions_total()
+        _invalidate_page1_body()
+        audit_log(action="delete", resource_type="function", resource_id=gbf_id)
+        return jsonify({'success': True, 'message': 'Function deleted successfully'})
+    except Exception as e:
+        logger.error(f"Error deleting function {gbf_id}: {str(e)}")
+        return jsonify({'error': 'DATABASE_ERROR', 'message': str(e)}), 500
+
+
+@functions_bp.route('/get_function_with_parameters/<int:gbf_id>', methods=['GET'])
+def get_function_with_parameters(gbf_id):
+    """Return a function together with its ordered parameter list."""
+    try:
+        # One round-trip: the parameters aggregate into a JSON array
+        # inside the query instead of a second SELECT per request.
+        function = query_db(
+            "SELECT f.*, COALESCE((SELECT json_group_array(json_object("
+            "'PARAM_ID', p.PARAM_ID, 'PARAM_NAME', p.PARAM_NAME, "
+            "'PARAM_TYPE', p.PARAM_TYPE, 'PARAM_ORDER', p.PARAM_ORDER)) "
+            "FROM (SELECT PARAM_ID, PARAM_NAME, PARAM_TYPE, PARAM_ORDER "
+            "      FROM GEE_BASE_FUNCTIONS_PARAMS WHERE GBF_ID = f.GBF_ID "
+            "      ORDER BY PARAM_ORDER) p), '[]') AS PARAMETERS "
+            "FROM GEE_BASE_FUNCTIONS f WHERE f.GBF_ID = ?",
+            (gbf_id,), one=True)
+        if not function:
+            return jsonify({
+                'error': 'RESOURCE_NOT_FOUND',
+                'message': f'Function {gbf_id} not found',
+            }), 404
+
+        result = dict(function)
+        result['parameters'] = orjson.loads(result.pop('PARAMETERS'))
+        return jsonify(result)
+    except Exception as e:
+        logger.error(f"Error getting function {gbf_id} with parameters: {str(e)}")
+        return jsonify({'error': 'INTERNAL_ERROR', 'message': str(e)}), 500
+
+
+@functions_bp.route('/get_function_parameters/<int:gbf_id>', methods=['GET'])
+def get_function_parameters(gbf_id):
+    """Return only the parameter rows of a function."""
+    try:
+        params = query_db(
+            "SELECT PARAM_ID, PARAM_NAME, PARAM_TYPE, PARAM_ORDER "
+            "FROM GEE_BASE_FUNCTIONS_PARAMS WHERE GBF_ID = ? ORDER BY PARAM_ORDER",
+            (gbf_id,))
+        # The orjson provider serializes Row objects directly.
+        return jsonify(params)
+    except Exception as e:
+        logger.error(f"Error getting parameters for function {gbf_id}: {str(e)}")
+        return jsonify({'error': 'INTERNAL_ERROR', 'message': str(e)}), 500
+
+
+@functions_bp.route('/add_function_parameter/<int:gbf_id>', methods=['POST'])
+def add_function_parameter(gbf_id):
+    """Append a parameter row to a function."""
+    data = request.get_json(silent=True) or {}
+    if not data.get('paramName') or not data.get('paramType'):
+        return jsonify({
+            'error': 'VALIDATION_ERROR',
+            'message': 'paramName and paramType are required',
+        }), 400
+    try:
+        modify_db(
+            "INSERT INTO GEE_BASE_FUNCTIONS_PARAMS "
+            "(GBF_ID, PARAM_NAME, PARAM_TYPE, PARAM_ORDER) VALUES (?, ?, ?, ?)",
+            (gbf_id, data['paramName'], data['paramType'], data.get('paramOrder', 0)),
+        )
+        _invalidate_page1_body()
+        return jsonify({'success': True, 'message': 'Parameter added successfully'})
+    except Exception as e:
+        logger.error(f"Error adding parameter to function {gbf_id}: {str(e)}")
+        return jsonify({'error': 'DATABASE_ERROR', 'message': str(e)}), 500
+
+
+@functions_bp.route('/delete_function_parameter/<int:param_id>', methods=['DELETE', 'POST'])
+def delete_function_parameter(param_id):
+    """Delete a single parameter row."""
+    try:
+        existing = query_db(
+            "SELECT PARAM_ID FROM GEE_BASE_FUNCTIONS_PARAMS WHERE PARAM_ID = ?",
+            (param_id,), one=True)
+        if not existing:
+            return jsonify({
+                'error': 'RESOURCE_NOT_FOUND',
+                'message': f'Parameter {param_id} not found',
+            }), 404
+        modify_db("DELETE FROM GEE_BASE_FUNCTIONS_PARAMS WHERE PARAM_ID = ?", (param_id,))
+        _invalidate_page1_body()
+        return jsonify({'success': True, 'message': 'Parameter deleted successfully'})
+    except Exception as e:
+        logger.error(f"Error deleting parameter {param_id}: {str(e)}")
+        return jsonify({'error': 'DATABASE_ERROR', 'message': str(e)}), 500
@@ -0,0 +1,255 @@
+"""
+Rule group routes.
+
+Maintains GRG_RULE_GROUPS and the GRG_RULE_GROUP_RULES mapping table that
+assigns ordered rules to a group. Groups are what the flow designer drops
+onto the canvas.
+"""
+
+import threading
+
+import orjson
+from cachetools import TTLCache
+from flask import Blueprint, Response, request, jsonify, render_template
+
+from db_helpers import query_db, transaction
+from json_helpers import json_default
+from logging_config import get_logger, audit_log
+
+logger = get_logger(__name__)
+
+rule_groups_bp = Blueprint('rule_groups', __name__, url_prefix='/rule-groups')
+
+# Encoded response bodies for the two hot list endpoints. Rules have no
+# write path in Forge, so the TTL alone bounds their staleness; the
+# group list is dropped by the write endpoints below.
+_RULES_BODY = TTLCache(maxsize=32, ttl=60)
+_RULES_LOCK = threading.Lock()
+_GROUPS_BODY = TTLCache(maxsize=1, ttl=30)
+_GROUPS_LOCK = threading.Lock()
+
+
+def _invalidate_groups_body():
+    """Drop the cached group list after a write."""
+    with _GROUPS_LOCK:
+        _GROUPS_BODY.pop('body', None)
+
+
+# Rows per multi-row INSERT: three parameters each keeps a full chunk
+# comfortably under SQLite's 999 bound-parameter limit.
+_ASSIGN_CHUNK = 200
+
+# Timestamps are computed inside SQLite (localtime, to match the rows
+# the old Python strftime wrote) instead of formatting per request.
+_NOW = "datetime('now', 'localtime')"
+
+
+def _insert_assignments(db, grg_id, rule_ids):
+    """Insert a group's rule assignments with multi-row VALUES.
+
+    One INSERT carries up to _ASSIGN_CHUNK rows, so the typical payload
+    runs a single statement instead of one dispatch per row.
+    """
+    rows = [(grg_id, rule_id, sequence)
+            for sequence, rule_id in enumerate(rule_ids, start=1)]
+    for start in range(0, len(rows), _ASSIGN_CHUNK):
+        chunk = rows[start:start + _ASSIGN_CHUNK]
+        placeholders = ", ".join([f"(?, ?, ?, {_NOW})"] * len(chunk))
+        db.execute(
+            "INSERT INTO GRG_RULE_GROUP_RULES (GRG_ID, RULE_ID, SEQUENCE, "
+            f"CREATE_DATE) VALUES {placeholders}",
+            [value for row in chunk for value in row])
+
+
+@rule_groups_bp.route('/')
+def rule_groups_page():
+    """Render the rule groups maintenance page."""
+    return render_template('rule_groups.html')
+
+
+@rule_groups_bp.route('/get_rules', methods=['GET'])
+def get_rules():
+    """Paginated list of rules available for assignment."""
+    try:
+        page = max(int(request.args.get('page', 1)), 1)
+        per_page = min(max(int(request.args.get('per_page', 10)), 1), 100)
+        search = request.args.get('search', '').strip()
+        offset = (page - 1) * per_page
+
+        # Identical requests within the TTL are served straight from the
+        # encoded-body cache — no SQL, no re-serialization.
+        key = (page, per_page, search)
+        with _RULES_LOCK:
+            body = _RULES_BODY.get(key)
+        if body is not None:
+            return Response(body, mimetype='application/json')
+
+        where = ''
+        args = []
+        if search:
+            like = f'%{search}%'
+            where = "WHERE RULE_NAME LIKE ? OR DESCRIPTION LIKE ?"
+            args = [like, like]
+
+        total_row = query_db(
+            f"SELECT COUNT(*) AS CNT FROM GRG_RULES {where}",
+            tuple(args), one=True)
+        total = total_row['CNT'] if total_row else 0
+
+        rules = query_db(
+            f"SELECT RULE_ID, RULE_NAME, RULE_TYPE, DESCRIPTION, CREATE_DATE "
+            f"FROM GRG_RULES {where} ORDER BY RULE_NAME LIMIT ? OFFSET ?",
+            tuple(args) + (per_page, offset))
+
+        pages = (total + per_page - 1) // per_page if total else 0
+        body = orjson.dumps({
+            'rules': rules,
+            'pagination': {
+                'total': total,
+                'pages': pages,
+                'current_page': page,
+                'per_page': per_page,
+                'has_next': page < pages,
+                'has_prev': page > 1,
+            },
+        }, default=json_default)
+        with _RULES_LOCK:
+            _RULES_BODY[key] = body
+        return Response(body, mimetype='application/json')
+    except Exception as e:
+        logger.error(f"Error getting rules: {str(e)}")
+        return jsonify({'error': 'INTERNAL_ERROR', 'message': str(e)}), 500
+
+
+@rule_groups_bp.route('/get_rule_groups', methods=['GET'])
+def get_rule_groups():
+    """List all rule groups with their assigned-rule counts."""
+    try:
+        with _GROUPS_LOCK:
+            body = _GROUPS_BODY.get('body')
+        if body is not None:
+            return Response(body, mimetype='application/json')
+        groups = query_db(
+            "SELECT g.GRG_ID, g.GROUP_NAME, g.COND_TYPE, g.DESCRIPTION, "
+            "g.CREATE_DATE, g.UPDATE_DATE, "
+            "(SELECT COUNT(*) FROM GRG_RULE_GROUP_RULES m "
+            " WHERE m.GRG_ID = g.GRG_ID) AS RULE_COUNT "
+            "FROM GRG_RULE_GROUPS g ORDER BY g.GROUP_NAME")
+        body = orjson.dumps(groups, default=json_default)
+        with _GROUPS_LOCK:
+            _GROUPS_BODY['body'] = body
+        return Response(body, mimetype='application/json')
+    except Exception as e:
+        logger.error(f"Error getting rule groups: {str(e)}")
+        return jsonify({'error': 'INTERNAL_ERROR', 'message': str(e)}), 500
+
+
+@rule_groups_bp.route('/get_assigned_rules/<int:grg_id>', methods=['GET'])
+def get_assigned_rules(grg_id):
+    """Return the ordered rules assigned to one group."""
+    try:
+        rules = query_db(
+            "SELECT r.RULE_ID, r.RULE_NAME, r.RULE_TYPE, r.DESCRIPTION, "
+            "m.SEQUENCE FROM GRG_RULE_GROUP_RULES m "
+            "JOIN GRG_RULES r ON r.RULE_ID = m.RULE_ID "
+            "WHERE m.GRG_ID = ? ORDER BY m.SEQUENCE",
+            (grg_id,))
+        # The orjson provider serializes Row objects directly.
+        return jsonify(rules)
+    except Exception as e:
+        logger.error(f"Error getting assigned rules for group {grg_id}: {str(e)}")
+        return jsonify({'error': 'INTERNAL_ERROR', 'message': str(e)}), 500
+
+
+@rule_groups_bp.route('/add_rule_group', methods=['POST'])
+def add_rule_group():
+    """Create a rule group and assign its initial rules."""
+    data = request.get_json(silent=True) or {}
+    if not data.get('groupName'):
+        return jsonify({
+            'error': 'VALIDATION_ERROR',
+            'message': 'groupName is required',
+        }), 400
+
+    try:
+        # Group header and assignments land in one transaction: the
+        # assignments go in chunked multi-row INSERTs and the whole
+        # create pays one fsync.
+        with transaction() as db:
+            grg_id = db.execute(
+                "INSERT INTO GRG_RULE_GROUPS (GROUP_NAME, COND_TYPE, DESCRIPTION, "
+                f"CREATE_DATE) VALUES (?, ?, ?, {_NOW})",
+                (data['groupName'], data.get('condType', 'ALL'),
+                 data.get('description', '')),
+            ).lastrowid
+            rule_ids = data.get('ruleIds', [])
+            if rule_ids:
+                _insert_assignments(db, grg_id, rule_ids)
+        _invalidate_groups_body()
+        audit_log(action="create", resource_type="rule_group",
+                  resource_id=data['groupName'], group_id=grg_id)
+        return jsonify({'success': True, 'grg_id': grg_id,
+                        'message': 'Rule group added successfully'})
+    except Exception as e:
+        logger.error(f"Error adding rule group: {str(e)}")
+        return jsonify({'error': 'DATABASE_ERROR', 'message': str(e)}), 500
+
+
+@rule_groups_bp.route('/update_rule_group/<int:grg_id>', methods=['PUT', 'POST'])
+def update_rule_group(grg_id):
+    """Update a group's metadata and replace its rule assignments."""
+    data = request.get_json(silent=True) or {}
+    if not data.get('groupName'):
+        return jsonify({
+            'error': 'VALIDATION_ERROR',
+            'message': 'groupName is required',
+        }), 400
+
+    try:
+        existing = query_db(
+            "SELECT GRG_ID FROM GRG_RULE_GROUPS WHERE GRG_ID = ?",
+            (grg_id,), one=True)
+        if not existing:
+            return jsonify({
+                'error': 'RESOURCE_NOT_FOUND',
+                'message': f'Rule group {grg_id} not found',
+            }), 404
+
+        # Metadata update and assignment rewrite are atomic: a failure
+        # can no longer leave the group stripped of its rules, and the
+        # per-rule INSERT loop collapses into multi-row INSERTs.
+        with transaction() as db:
+            db.execute(
+                "UPDATE GRG_RULE_GROUPS SET GROUP_NAME = ?, COND_TYPE = ?, "
+                f"DESCRIPTION = ?, UPDATE_DATE = {_NOW} WHERE GRG_ID = ?",
+                (data['groupName'], data.get('condType', 'ALL'),
+                 data.get('description', ''), grg_id),
+            )
+            db.execute("DELETE FROM GRG_RULE_GROUP_RULES WHERE GRG_ID = ?", (grg_id,))
+            rule_ids = data.get('ruleIds', [])
+            if rule_ids:
+                _insert_assignments(db, grg_id, rule_ids)
+        _invalidate_groups_body()
+        audit_log(action="update", resource_type="rule_group",
+                  resource_id=data['groupName'], group_id=grg_id)
+        return jsonify({'success': True, 'message': 'Rule group updated successfully'})
+    except Exception as e:
+        logger.error(f"Error updating rule group {grg_id}: {str(e)}")
+        return jsonify({'error': 'DATABASE_ERROR', 'message': str(e)}), 500
+
+
+@rule_groups_bp.route('/delete_rule_group/<int:grg_id>', methods=['DELETE', 'POST'])
+def delete_rule_group(grg_id):
+    """Delete a rule group and its assignments."""
+    try:
+        # Assignments and group row delete atomically with one commit.
+        with transaction() as db:
+            db.execute("DELETE FROM GRG_RULE_GROUP_RULES WHERE GRG_ID = ?",
+                       (grg_id,))
+            db.execute("DELETE FROM GRG_RULE_GROUPS WHERE GRG_ID = ?", (grg_id,))
+        _invalidate_groups_body()
+        audit_log(action="delete", resource_type="rule_group", resource_id=grg_id)
+        return jsonify({'success': True, 'message': 'Rule group deleted successfully'})
+    except Exception as e:
+        logger.error(f"Error deleting rule group {grg_id}: {str(e)}")
+        return jsonify({'error': 'DATABASE_ERROR', 'message': str(e)}), 500
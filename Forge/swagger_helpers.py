@@ -0,0 +1,111 @@
+"""
+Helpers for the Swagger/OpenAPI field-mapping endpoints.
+
+A field mapping config ties JSONPath expressions in an incoming request
+payload to (field class, field) pairs defined in GEE_FIELD_CLASSES /
+GEE_FIELDS, so Praxis can hydrate worker variables from API traffic.
+"""
+
+import functools
+import sys
+
+
+# Characters that mark a path as real JSONPath (filters, wildcards,
+# indexing); anything without them is a plain dotted path.
+_JSONPATH_SPECIALS = frozenset('$[]*?@()')
+
+
+@functools.lru_cache(maxsize=1024)
+def _path_tokens(path_str):
+    """Tokenize a plain dotted path, or None if it needs full JSONPath."""
+    if not path_str or any(c in _JSONPATH_SPECIALS for c in path_str):
+        return None
+    return tuple(path_str.split('.'))
+
+
+@functools.lru_cache(maxsize=1024)
+def _compile_path(path_str):
+    """Compile a JSONPath expression, caching the result.
+
+    jsonpath_ng rebuilds its parser tables on every parse() call; mapping
+    configs reuse the same handful of paths across requests, so caching
+    the compiled expression removes the parse from the hot path.
+    """
+    from jsonpath_ng import parse as jsonpath_parse
+    return jsonpath_parse(path_str)
+
+
+def validate_field_mapping_config(field_mapping, field_classes, fields):
+    """Check every mapping entry references a known class/field pair.
+
+    Returns (is_valid, errors) where errors is a list of human-readable
+    problems found in the mapping config.
+    """
+    errors = []
+    class_names = {fc['FIELD_CLASS_NAME'] for fc in field_classes}
+    field_names = {(f['GFC_ID'], f['GF_NAME']) for f in fields}
+    class_ids = {fc['FIELD_CLASS_NAME']: fc['GFC_ID'] for fc in field_classes}
+
+    for mapping_key, mapping in field_mapping.items():
+        if not isinstance(mapping, dict):
+            errors.append(f"Mapping '{mapping_key}' must be an object")
+            continue
+        # Intern the identifier strings in place: the lookups below (and
+        # map_request_to_fields afterwards) then hash and compare them by
+        # pointer against the interned metadata names.
+        field_class = mapping.get('field_class')
+        if isinstance(field_class, str):
+            field_class = mapping['field_class'] = sys.intern(field_class)
+        field_name = mapping.get('field_name')
+        if isinstance(field_name, str):
+            field_name = mapping['field_name'] = sys.intern(field_name)
+        request_path = mapping.get('request_path')
+
+        if not field_class or field_class not in class_names:
+            errors.append(f"Mapping '{mapping_key}': unknown field class '{field_class}'")
+            continue
+        if not field_name or (class_ids[field_class], field_name) not in field_names:
+            errors.append(f"Mapping '{mapping_key}': unknown field '{field_name}' "
+                          f"in class '{field_class}'")
+        if not request_path:
+            errors.append(f"Mapping '{mapping_key}': request_path is required")
+
+    return len(errors) == 0, errors
+
+
+def map_request_to_fields(request_data, field_mapping):
+    """Resolve every mapping's JSONPath against a sample request payload.
+
+    Returns a dict of mapping_key -> {'field_class', 'field_name', 'value'}.
+    Unresolvable paths map to a None value rather than failing the batch.
+    """
+    resolved = {}
+    for mapping_key, mapping in field_mapping.items():
+        # Interned path strings make the lru_cache key comparison a
+        # pointer check on repeat lookups.
+        request_path = sys.intern(mapping.get('request_path', ''))
+        tokens = _path_tokens(request_path)
+        if tokens is not None:
+            # Mapping configs are overwhelmingly plain dotted paths;
+            # direct dict traversal beats the JSONPath evaluator by an
+            # order of magnitude and allocates nothing.
+            value = request_data
+            for key in tokens:
+                if isinstance(value, dict):
+                    value = value.get(key)
+                else:
+                    value = None
+                    break
+        else:
+            try:
+                expression = _compile_path(request_path)
+                matches = expression.find(request_data)
+                value = matches[0].value if matches else None
+            except Exception:
+                value = None
+        resolved[mapping_key] = {
+            'field_class': mapping.get('field_class'),
+            'field_name': mapping.get('field_name'),
+            'value': value,
+        }
+    return resolved
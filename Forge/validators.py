@@ -0,0 +1,259 @@
+"""
+Forge Input Validators
+Implements Commandment 5: Validate Every Input at the Boundary
+
+Marshmallow schemas for the JSON bodies accepted by the route handlers plus
+a SecurityValidator with defensive checks for SQL fragments, file paths and
+filenames that originate from user input.
+"""
+
+import html
+import re
+
+from marshmallow import (
+    Schema, fields, post_load, validate,
+    ValidationError as MarshmallowValidationError,
+)
+
+from exceptions import ValidationError
+
+# Function and rule names must be valid identifiers.
+IDENTIFIER_PATTERN = re.compile(r'^[a-zA-Z_][a-zA-Z0-9_]*$')
+
+_SQL_INJECTION_PATTERN = re.compile(
+    r"('|--|;|<\s*script|\bunion\b|\bselect\b|\binsert\b|\bupdate\b|"
+    r"\bdelete\b|\bdrop\b|\bexec\b|\bsleep\s*\(|\bchar\s*\(|\bbenchmark\s*\()",
+    re.IGNORECASE,
+)
+
+_FILENAME_STRIP_PATTERN = re.compile(r'[<>:"/\\|?*\x00-\x1f]')
+
+
+class _SanitizingSchema(Schema):
+    """Base schema that HTML-escapes all loaded string values."""
+
+    @post_load
+    def _escape_strings(self, data, **kwargs):
+        for key, value in data.items():
+            if isinstance(value, str):
+                data[key] = html.escape(value)
+        return data
+
+
+class CreateFunctionSchema(_SanitizingSchema):
+    """Validates payloads for POST /functions/add_function."""
+
+    functionName = fields.String(
+        required=True,
+        validate=[
+            validate.Length(min=1, max=100),
+            validate.Regexp(IDENTIFIER_PATTERN,
+                            error='Function name must be a valid identifier'),
+        ],
+    )
+    paramCount = fields.Integer(
+        required=True,
+        validate=validate.Range(min=0, max=20),
+    )
+    description = fields.String(
+        load_default='',
+        validate=validate.Length(max=500),
+    )
+
+
+class UpdateFunctionSchema(CreateFunctionSchema):
+    """Validates payloads for POST /functions/update_function."""
+
+    gbfId = fields.Integer(
+        required=True,
+        validate=validate.Range(min=1),
+    )
+
+
+class CreateRuleSchema(_SanitizingSchema):
+    """Validates payloads for rule creation."""
+
+    name = fields.String(
+        required=True,
+        validate=validate.Length(min=1, max=100),
+    )
+    description = fields.String(
+        load_default='',
+        validate=validate.Length(max=500),
+    )
+    conditions = fields.List(
+        fields.Dict(),
+        required=True,
+        validate=validate.Length(min=1, max=10),
+    )
+    actions = fields.List(
+        fields.Dict(),
+        required=True,
+        validate=validate.Length(min=1, max=5),
+    )
+    priority = fields.Integer(
+        load_default=100,
+        validate=validate.Range(min=0, max=1000),
+    )
+    is_active = fields.Boolean(load_default=True)
+
+    @post_load
+    def _escape_strings(self, data, **kwargs):
+        # Conditions/actions are structured dicts; only escape flat strings.
+        for key in ('name', 'description'):
+            if isinstance(data.get(key), str):
+                data[key] = html.escape(data[key])
+        return data
+
+
+class CreateFlowSchema(_SanitizingSchema):
+    """Validates payloads for POST /flow-designer/save_flow."""
+
+    flowName = fields.String(
+        required=True,
+        validate=validate.Length(min=1, max=100),
+    )
+    description = fields.String(
+        load_default='',
+        validate=validate.Length(max=500),
+    )
+    nodes = fields.List(fields.Dict(), load_default=list)
+    connections = fields.List(fields.Dict(), load_default=list)
+
+    @post_load
+    def _escape_strings(self, data, **kwargs):
+        for key in ('flowName', 'description'):
+            if isinstance(data.get(key), str):
+                data[key] = html.escape(data[key])
+        return data
+
+
+class ConnectionConfigSchema(_SanitizingSchema):
+    """Validates database connection configuration payloads."""
+
+    name = fields.String(
+        required=True,
+        validate=validate.Length(min=1, max=100),
+    )
+    connection_type = fields.String(
+        required=True,
+        validate=validate.OneOf(['mysql', 'oracle', 'postgresql', 'sqlite']),
+    )
+    host = fields.String(
+        required=True,
+        validate=validate.Length(min=1, max=255),
+    )
+    port = fields.Integer(
+        required=True,
+        validate=validate.Range(min=1, max=65535),
+    )
+    database = fields.String(
+        required=True,
+        validate=validate.Length(min=1, max=255),
+    )
+    username = fields.String(
+        required=True,
+        validate=validate.Length(min=1, max=100),
+    )
+    password = fields.String(required=True)
+
+    @post_load
+    def _escape_strings(self, data, **kwargs):
+        # Credentials are passed to drivers verbatim; never rewrite them.
+        return data
+
+
+class PaginationSchema(Schema):
+    """Validates pagination query parameters."""
+
+    page = fields.Integer(
+        load_default=1,
+        validate=validate.Range(min=1, max=1000),
+    )
+    per_page = fields.Integer(
+        load_default=10,
+        validate=validate.Range(min=1, max=100),
+    )
+    search = fields.String(
+        load_default='',
+        validate=validate.Length(max=100),
+    )
+
+
+class SecurityValidator:
+    """Defensive checks for values that end up near SQL or the filesystem."""
+
+    @staticmethod
+    def validate_sql_input(value):
+        """Return False when a string looks like a SQL injection attempt."""
+        if not isinstance(value, str):
+            return False
+        return _SQL_INJECTION_PATTERN.search(value) is None
+
+    @staticmethod
+    def validate_file_path(path):
+        """Return False for absolute paths, traversal attempts or home refs."""
+        if not isinstance(path, str) or not path:
+            return False
+        if '..' in path or path.startswith(('/', '~', '\\')):
+            return False
+        if re.match(r'^[a-zA-Z]:', path):
+            return False
+        return True
+
+    @staticmethod
+    def sanitize_filename(filename, max_length=100):
+        """Strip dangerous characters and cap the filename length while
+        preserving the extension."""
+        cleaned = _FILENAME_STRIP_PATTERN.sub('_', filename)
+        if len(cleaned) <= max_length:
+            return cleaned
+        if '.' in cleaned:
+            stem, ext = cleaned.rsplit('.', 1)
+            keep = max_length - len(ext) - 1
+            return stem[:max(keep, 1)] + '.' + ext
+        return cleaned[:max_length]
+
+    @staticmethod
+    def validate_json_structure(data, max_depth=10, max_keys=1000, _depth=0):
+        """Reject pathologically nested or oversized JSON structures."""
+        if _depth > max_depth:
+            return False
+        if isinstance(data, dict):
+            if len(data) > max_keys:
+                return False
+            return all(
+                SecurityValidator.validate_json_structure(
+                    v, max_depth, max_keys, _depth + 1)
+                for v in data.values())
+        if isinstance(data, (list, tuple)):
+            return all(
+                SecurityValidator.validate_json_structure(
+                    v, max_depth, max_keys, _depth + 1)
+                for v in data)
+        return True
+
+
+def validate_with_schema(schema, data):
+    """Load ``data`` through ``schema``, raising a ForgeError on failure.
+
+    ``schema`` may be a Schema instance or a Schema class; classes are
+    instantiated here so callers can pass either.
+    """
+    if data is None:
+        raise ValidationError("Request body is required", field='body')
+    if isinstance(schema, type):
+        schema = schema()
+    try:
+        return schema.load(data)
+    except MarshmallowValidationError as e:
+        messages = e.messages if isinstance(e.messages, dict) else {}
+        raise ValidationError(
+            f"Validation failed: {e.messages}",
+            field=next(iter(messages), None),
+            details={
+                'validation_errors': e.messages,
+                'failed_fields': list(messages),
+            },
+            cause=e,
+        )
@@ -0,0 +1,65 @@
+"""
+Tests for Database Routes
+Implements Commandment 4: Complete Unit Tests Are Mandatory
+"""
+
+import pytest
+
+
+class TestGetActiveConnections:
+    """Test the polled active-connections endpoint."""
+
+    def test_get_active_connections_empty(self, client, mock_db_connection):
+        """Test the endpoint with no registered handles."""
+        response = client.get('/database/get_active_connections'
+                              '?app_runtime_id=rt-1')
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data['success'] is True
+        assert data['connections'] == []
+
+    def test_get_active_connections_resolves_names(self, client,
+                                                   mock_db_connection):
+        """Test stored handles resolve their environment/database names.
+
+        Covers both join arms of the single-statement read: a handle
+        tied to a saved config (GEE_DATABASE_CONFIGS) and a legacy
+        handle resolved through GEE_ENV_CONFIG.
+        """
+        mock_db_connection.execute(
+            "INSERT INTO GEE_ENVIRONMENTS (ENV_ID, ENV_NAME, ENV_TYPE) "
+            "VALUES (1, 'DEV', 'DEV')")
+        mock_db_connection.execute(
+            "INSERT INTO GEE_DATABASE_CONFIGS "
+            "(DB_CONFIG_ID, ENV_ID, DB_NAME, DB_DISPLAY_NAME, DB_TYPE) "
+            "VALUES (7, 1, 'gee_dev', 'GEE Dev', 'Postgres')")
+        mock_db_connection.execute(
+            "INSERT INTO GEE_ENV_CONFIG (GT_ID, ENV_NAME, DB_NAME, DB_TYPE) "
+            "VALUES (3, 'LEGACY', 'gee_old', 'Oracle')")
+        mock_db_connection.execute(
+            "INSERT INTO GEE_ACTIVE_CONNECTIONS "
+            "(HANDLE, CONFIG_ID, DB_CONFIG_ID, APP_RUNTIME_ID) "
+            "VALUES ('saved_h', 0, 7, 'rt-1')")
+        mock_db_connection.execute(
+            "INSERT INTO GEE_ACTIVE_CONNECTIONS "
+            "(HANDLE, CONFIG_ID, APP_RUNTIME_ID) "
+            "VALUES ('legacy_h', 3, 'rt-1')")
+        mock_db_connection.execute(
+            "INSERT INTO GEE_ACTIVE_CONNECTIONS "
+            "(HANDLE, CONFIG_ID, APP_RUNTIME_ID) "
+            "VALUES ('other_h', 3, 'rt-2')")
+        mock_db_connection.commit()
+
+        response = client.get('/database/get_active_connections'
+                              '?app_runtime_id=rt-1')
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data['success'] is True
+
+        by_handle = {c['handle']: c for c in data['connections']}
+        assert set(by_handle) == {'saved_h', 'legacy_h'}
+        assert by_handle['saved_h']['env_name'] == 'DEV'
+        assert by_handle['saved_h']['db_type'] == 'Postgres'
+        assert by_handle['saved_h']['db_display_name'] == 'GEE Dev'
+        assert by_handle['legacy_h']['env_name'] == 'LEGACY'
+        assert by_handle['legacy_h']['db_type'] == 'Oracle'
@@ -0,0 +1,75 @@
+"""
+Tests for Fields Routes
+Implements Commandment 4: Complete Unit Tests Are Mandatory
+"""
+
+import json
+
+import pytest
+
+
+def create_test_field_class(db, name='TestClass', class_type='INPUT'):
+    """Helper to create a field class in the database."""
+    cursor = db.execute(
+        'INSERT INTO GEE_FIELD_CLASSES (FIELD_CLASS_NAME, CLASS_TYPE) '
+        'VALUES (?, ?)',
+        (name, class_type)
+    )
+    db.commit()
+    return cursor.lastrowid
+
+
+def create_test_field(db, gfc_id, name='test_field', field_type='TEXT'):
+    """Helper to create a field in the database."""
+    cursor = db.execute(
+        'INSERT INTO GEE_FIELDS (GFC_ID, GF_NAME, GF_TYPE) VALUES (?, ?, ?)',
+        (gfc_id, name, field_type)
+    )
+    db.commit()
+    return cursor.lastrowid
+
+
+class TestFieldsCollectionAPI:
+    """Test the streamed field collection resource."""
+
+    def test_get_fields_collection(self, client, mock_db_connection):
+        """Test GET /api/fields/ streams the field collection."""
+        gfc_id = create_test_field_class(mock_db_connection)
+        create_test_field(mock_db_connection, gfc_id, name='beta_field')
+        create_test_field(mock_db_connection, gfc_id, name='alpha_field')
+
+        response = client.get('/api/fields/')
+        assert response.status_code == 200
+
+        fields = json.loads(response.get_data(as_text=True))
+        assert [f['GF_NAME'] for f in fields] == ['alpha_field', 'beta_field']
+
+    def test_get_fields_collection_no_trailing_slash(self, client,
+                                                     mock_db_connection):
+        """Test the collection also answers without the trailing slash."""
+        response = client.get('/api/fields')
+        assert response.status_code == 200
+        assert json.loads(response.get_data(as_text=True)) == []
+
+    def test_post_field(self, client, mock_db_connection):
+        """Test POST /api/fields/ creates a field and returns it."""
+        gfc_id = create_test_field_class(mock_db_connection)
+
+        response = client.post(
+            '/api/fields/',
+            data=json.dumps({
+                'GFC_ID': gfc_id,
+                'GF_NAME': 'new_field',
+                'GF_TYPE': 'NUMBER',
+            }),
+            content_type='application/json'
+        )
+        assert response.status_code == 201
+        data = response.get_json()
+        assert data['GF_NAME'] == 'new_field'
+
+        row = mock_db_connection.execute(
+            'SELECT GF_NAME FROM GEE_FIELDS WHERE GF_ID = ?',
+            (data['GF_ID'],)
+        ).fetchone()
+        assert row['GF_NAME'] == 'new_field'
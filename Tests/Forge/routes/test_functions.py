@@ -171,31 +171,31 @@ class TestFunctionsRoutes:
         # Should be rejected by validation or security middleware
         assert response.status_code in [400, 403]
     
-    def test_add_function_xss_attempt(self, client):
+    def test_add_function_xss_attempt(self, client, mock_db_connection):
         """Test function creation with XSS attempt."""
         data = {
             'functionName': 'test_function',
             'paramCount': 1,
             'description': '<script>alert("xss")</script>'
         }
-        
+
         response = client.post(
             '/functions/add_function',
             data=json.dumps(data),
             content_type='application/json'
         )
-        
-        # Should be sanitized by validation
-        if response.status_code == 200:
-            # Verify XSS was sanitized by checking database
-            cursor = mock_db_connection.execute(
-                'SELECT DESCRIPTION FROM GEE_BASE_FUNCTIONS WHERE FUNC_NAME = ?',
-                ('test_function',)
-            )
-            result = cursor.fetchone()
-            description = result[0] if result else ''
-            assert '<script>' not in description
-            assert '&lt;script&gt;' in description  # Should be HTML escaped
+
+        # The schema accepts the payload but HTML-escapes string fields,
+        # so the stored description must carry the escaped form.
+        assert response.status_code == 200
+        cursor = mock_db_connection.execute(
+            'SELECT DESCRIPTION FROM GEE_BASE_FUNCTIONS WHERE FUNC_NAME = ?',
+            ('test_function',)
+        )
+        result = cursor.fetchone()
+        description = result[0] if result else ''
+        assert '<script>' not in description
+        assert '&lt;script&gt;' in description  # Should be HTML escaped
     
     def test_get_functions_pagination(self, client, mock_db_connection):
         """Test functions list with pagination."""
@@ -228,6 +228,29 @@ class TestFunctionsRoutes:
         assert len(data['functions']) == 5  # Remaining functions
         assert data['pagination']['current_page'] == 2
     
+    def test_get_functions_actual_param_count(self, client, mock_db_connection):
+        """Test listing reports the trigger-maintained actual param count."""
+        gbf_id = create_test_function(mock_db_connection, name='with_params',
+                                      param_count=2)
+        create_test_function(mock_db_connection, name='without_params',
+                             param_count=3)
+        for order, name in enumerate(('amount', 'rate'), start=1):
+            mock_db_connection.execute(
+                'INSERT INTO GEE_BASE_FUNCTIONS_PARAMS '
+                '(GBF_ID, PARAM_NAME, PARAM_TYPE, PARAM_ORDER) '
+                'VALUES (?, ?, ?, ?)',
+                (gbf_id, name, 'NUMBER', order)
+            )
+        mock_db_connection.commit()
+
+        response = client.get('/functions/get_functions')
+        assert response.status_code == 200
+
+        counts = {f['FUNC_NAME']: f['ACTUAL_PARAM_COUNT']
+                  for f in response.get_json()['functions']}
+        assert counts['with_params'] == 2
+        assert counts['without_params'] == 0
+
     def test_get_functions_search(self, client, mock_db_connection):
         """Test functions list with search."""
         # Create test functions with different names
@@ -246,7 +269,23 @@ class TestFunctionsRoutes:
         assert 'calculate_tax' in function_names
         assert 'calculate_interest' in function_names
         assert 'format_string' not in function_names
-    
+
+    def test_get_functions_search_prefix_match(self, client, mock_db_connection):
+        """Test FTS-backed search matches on token prefixes."""
+        create_test_function(mock_db_connection, name='calculate_tax')
+        create_test_function(mock_db_connection, name='format_string')
+        create_test_function(mock_db_connection, name='recalculate_total')
+
+        # 'calc' is a prefix of the 'calculate' token, so only
+        # calculate_tax should match ('recalculate' does not start
+        # with 'calc').
+        response = client.get('/functions/get_functions?search=calc')
+        assert response.status_code == 200
+
+        data = response.get_json()
+        function_names = [f['FUNC_NAME'] for f in data['functions']]
+        assert function_names == ['calculate_tax']
+
     @patch('routes.functions.audit_log')
     def test_add_function_audit_logging(self, mock_audit_log, client, mock_db_connection, test_function_data):
         """Test that function creation is audit logged."""
@@ -13,6 +13,13 @@ from unittest.mock import Mock, patch
 # Add the Forge directory to the Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'Forge'))
 
+# Point the app at a throwaway database before anything imports app or
+# db_helpers: app.py runs init_db at module level, which would otherwise
+# apply the startup migrations to the tracked instance/GEE.db and leave
+# the work tree dirty after every test run.
+os.environ['GEE_DB_PATH'] = os.path.join(
+    tempfile.gettempdir(), f'gee_test_{os.getpid()}.db')
+
 from config_manager import ConfigManager, ForgeConfig, AppConfig, ServerConfig, DatabaseConfig
 from exceptions import ForgeError, DatabaseError, ValidationError
 from logging_config import get_logger
@@ -61,7 +68,8 @@ def mock_config_manager(test_config):
 def temp_db():
     """Create temporary in-memory database for testing."""
     conn = sqlite3.connect(':memory:')
-    
+    conn.row_factory = sqlite3.Row
+
     # Create test tables
     conn.execute('''
         CREATE TABLE GEE_BASE_FUNCTIONS (
@@ -72,7 +80,7 @@ def temp_db():
             CREATED_AT TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
     ''')
-    
+
     conn.execute('''
         CREATE TABLE GEE_BASE_FUNCTIONS_PARAMS (
             PARAM_ID INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -83,21 +91,46 @@ def temp_db():
             FOREIGN KEY (GBF_ID) REFERENCES GEE_BASE_FUNCTIONS (GBF_ID)
         )
     ''')
-    
-    conn.execute('''
-        CREATE TABLE GEE_ACTIVE_CONNECTIONS (
-            ID INTEGER PRIMARY KEY AUTOINCREMENT,
-            APP_RUNTIME_ID TEXT NOT NULL,
-            CONNECTION_NAME TEXT NOT NULL,
-            CREATED_AT TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    
+
     conn.commit()
+
+    # Apply the startup migrations so the fixture carries the same
+    # derived schema the app relies on (FTS search index, sync triggers,
+    # param counts, GEE_ACTIVE_CONNECTIONS, ...).
+    from db_helpers import apply_sql_script
+    updates_path = os.path.join(
+        os.path.dirname(__file__), '..', 'Forge', 'db_updates.sql')
+    with open(updates_path) as f:
+        apply_sql_script(conn, f.read())
+
     yield conn
     conn.close()
 
 
+@pytest.fixture(autouse=True)
+def reset_route_caches():
+    """Clear the route modules' TTL caches between tests.
+
+    The routes memoize totals and encoded response bodies across
+    requests; without a reset, one test's cached listing leaks into the
+    next and makes the suite order-dependent.
+    """
+    yield
+    loaded = sys.modules
+    functions = loaded.get('routes.functions')
+    if functions is not None:
+        functions._invalidate_functions_total()
+        functions._invalidate_page1_body()
+    rule_groups = loaded.get('routes.rule_groups')
+    if rule_groups is not None:
+        rule_groups._invalidate_groups_body()
+        with rule_groups._RULES_LOCK:
+            rule_groups._RULES_BODY.clear()
+    fields = loaded.get('routes.fields')
+    if fields is not None:
+        fields._invalidate_field_caches()
+
+
 @pytest.fixture
 def mock_db_connection(temp_db):
     """Mock database connection."""